@@ -1,14 +1,29 @@
-import gradio as gr
 import os
+# Gradio reads this at import time; an explicit environment setting still wins
+os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+import gradio as gr
 import sys
-import matplotlib
-matplotlib.use('Agg') # Non-interactive backend for server environments
-import matplotlib.pyplot as plt
-import io
+import ntpath
+import html
+import asyncio
+import atexit
+import shutil
+# Non-interactive backend for server environments. Set through the environment
+# so matplotlib itself is only imported once a chart is actually drawn.
+os.environ.setdefault("MPLBACKEND", "Agg")
+import threading
+import collections
+import functools
+import hashlib
+import jinja2
+import numpy as np
 from PIL import Image
+from gradio.utils import get_upload_folder
 from loguru import logger
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from types import SimpleNamespace
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +34,24 @@ LOG_FILE = "autopilot_devops.log"
 with open(LOG_FILE, "w") as f:
     f.write("--- AutoPilot DevOps System Session Started ---\n")
 
-logger.add(LOG_FILE, rotation="1 MB", format="{time:HH:mm:ss} | {level} | {message}")
+# Per-turn visualization diagnostics log at DEBUG; every sink stays at INFO so
+# those lazy messages are never formatted in normal operation
+logger.remove()
+logger.add(sys.stderr, level="INFO")
+logger.add(LOG_FILE, rotation="1 MB", level="INFO", format="{time:HH:mm:ss} | {level} | {message}")
+
+# The Logs tab polls every couple of seconds, so it reads the tail from memory
+# rather than re-reading the log file. The file sink above stays for persistence.
+_LOG_RING = collections.deque(["--- AutoPilot DevOps System Session Started ---\n"], maxlen=200)
+# Bumped on every record so pollers can tell "no new lines" without comparing text
+_LOG_SEQ = 0
+
+def _log_ring_sink(message):
+    global _LOG_SEQ
+    _LOG_RING.append(message)
+    _LOG_SEQ += 1
+
+logger.add(_log_ring_sink, level="INFO", format="{time:HH:mm:ss} | {level} | {message}")
 
 # --- 2. IMPORT AGENT ---
 try:
@@ -39,143 +71,236 @@ try:
 
 except ImportError as e:
     logger.error(f"Failed to import project modules: {e}")
+    Config = None
     # Fallback for UI testing if backend is missing
     class MockAgent:
-        def handle_message(self, msg):
-            return {
-                "response": "Backend modules missing. Please check import paths.",
-                "plan": {"action": "error", "risk_level": "LOW", "emotion": "Error", "distress_score": 0},
-                "safety_status": "SAFE"
-            }
+        def run(self, msg, repo_url=None, github_token=None):
+            # Same attribute shape as project.core.a2a_protocol.AgentResult
+            return SimpleNamespace(
+                response="Backend modules missing. Please check import paths.",
+                plan={"action": "error", "risk_level": "LOW", "emotion": "Error", "distress_score": 0},
+                safety_status="SAFE",
+                visualizations={},
+                dead_code_report={},
+                migration_plan_report={},
+                refactor_suggestions_report=[],
+                duplicate_code_report={},
+                postmortem_report={}
+            )
     agent_instance = MockAgent()
 
 # --- 3. HELPER FUNCTIONS ---
 
+# Chat window: the chatbot renders only the newest messages; older ones are
+# kept in the session and paged back in on request
+CHAT_MAX_MESSAGES = 200
+CHAT_LOAD_BATCH = 100
+
 def get_empty_state():
     """Returns initial state for a new user session."""
     return {
-        "complexity_history": [],  # Code complexity scores over time
+        # Code complexity scores over time; bounded so long sessions stay small
+        "complexity_history": collections.deque(maxlen=200),
         "msg_count": 0,
         "current_severity": "LOW",  # Severity of code issues
         "last_module": "None",  # Last analyzed module/file
-        "max_complexity": 0
+        "max_complexity": 0,
+        "chat_archive": [],  # Messages trimmed out of the chat window, oldest first
+        "chat_window": CHAT_MAX_MESSAGES,
+        "github_token": None  # Saved from the Settings tab; overrides the server's token
     }
 
+# Shared defaults for read-only callers (initial render, missing session).
+# Never handed to a session: response_generator mutates its state in place.
+_EMPTY_STATE = get_empty_state()
+
+# Chart images are written once as PNGs inside Gradio's cache directory and
+# handed to the gr.Image outputs by path. Gradio serves files already in its
+# cache as they are, so a repeated chart costs neither a PNG encode nor the
+# hash-and-copy Gradio applies to new files. The directory is per process so
+# charts drawn by an older version of this code are never served.
+_IMAGE_CACHE_DIR = os.path.join(get_upload_folder(), f"autopilot-{os.getpid()}")
+_IMAGE_CACHE_MAX_FILES = 256
+atexit.register(shutil.rmtree, _IMAGE_CACHE_DIR, ignore_errors=True)
+
+def _cached_png(key, render):
+    """Returns the cached PNG path for key, calling render() for a PIL image on a miss."""
+    path = os.path.join(_IMAGE_CACHE_DIR, f"{key}.png")
+    try:
+        os.utime(path)  # Mark as recently used for the sweep
+    except FileNotFoundError:
+        os.makedirs(_IMAGE_CACHE_DIR, exist_ok=True)
+        # Write under a temporary name so a concurrent reader never sees a partial file
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        render().save(tmp, format="PNG")
+        os.replace(tmp, path)
+        _sweep_image_cache()
+    return path
+
+def _sweep_image_cache():
+    """Deletes the least recently used PNGs beyond _IMAGE_CACHE_MAX_FILES."""
+    with os.scandir(_IMAGE_CACHE_DIR) as it:
+        entries = [e for e in it if e.name.endswith(".png")]
+    excess = len(entries) - _IMAGE_CACHE_MAX_FILES
+    if excess > 0:
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:excess]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+def _image_path(img):
+    """Returns the cached PNG path for a PIL image (or None), keyed on its pixels."""
+    if img is None:
+        return None
+    digest = hashlib.blake2b(f"{img.mode}{img.size}".encode(), digest_size=16)
+    digest.update(img.tobytes())
+    return _cached_png(digest.hexdigest(), lambda: img)
+
+# Complexity trend chart: built once and redrawn in place on every turn.
+# Figure construction dominates the cost of such a small plot, so the
+# Figure/Axes pair and its static styling are reused across calls.
+# The figure is attached straight to an Agg canvas, bypassing pyplot's global
+# figure registry, so it never needs plt.close().
+@functools.cache
+def _plot_figure():
+    """Imports matplotlib and builds the shared chart figure on first use."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(4.4, 1.28), facecolor='#1a1a1a')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    # Fixed margins sized for the title, axis labels and up to three-digit ticks.
+    # The chart shape never changes, so this replaces a tight_layout() pass per draw.
+    fig.subplots_adjust(left=0.135, right=0.966, top=0.778, bottom=0.387)
+    ax.set_facecolor('#1a1a1a')
+    ax.tick_params(axis='x', colors='#a0a0a0', labelsize=6.4)
+    ax.tick_params(axis='y', colors='#a0a0a0', labelsize=6.4)
+    for spine in ax.spines.values():
+        spine.set_color('#333333')
+        spine.set_linewidth(1)
+    return fig, ax
+
+# Gradio dispatches handlers on worker threads; the shared figure is not thread-safe
+_PLOT_LOCK = threading.Lock()
+
 def generate_plot(user_state):
     """Generates a matplotlib chart of code complexity metrics based on user state."""
     if user_state is None:
-        user_state = get_empty_state()
-        
-    history = user_state.get("complexity_history", [])
-    
-    # Create figure with light mode styling - compact size (80% scale)
-    fig = plt.figure(figsize=(4.4, 1.28), facecolor='#1a1a1a')
-    ax = plt.gca()
-    ax.set_facecolor('#1a1a1a')
-    
-    if not history:
-        plt.text(0.5, 0.5, 'Awaiting Analysis Request...', 
-                 horizontalalignment='center', verticalalignment='center', 
-                 transform=ax.transAxes, color='#a0a0a0', fontsize=12, fontweight=500)
-        plt.axis('off')
-    else:
-        x = list(range(1, len(history) + 1))
-        y = history
-        
-        # Dark mode colors
-        last_score = history[-1]
-        line_color = '#4ade80'  # Green
-        if last_score > 5: line_color = '#fbbf24'  # Amber
-        if last_score > 10: line_color = '#f87171'  # Red
-
-        plt.plot(x, y, marker='o', linestyle='-', color=line_color, linewidth=2.5, markersize=6, markerfacecolor='#1a1a1a', markeredgewidth=2)
-        plt.fill_between(x, y, color=line_color, alpha=0.2)
-        
-        plt.title("Code Complexity Trend", color='#e5e5e5', fontsize=8, fontweight=600, pad=3.2)
-        plt.xlabel("Analysis #", color='#a0a0a0', fontsize=6.4, fontweight=500)
-        plt.ylabel("Complexity Score", color='#a0a0a0', fontsize=6.4, fontweight=500)
-        plt.ylim(0, max(max(history) * 1.15, 15) if history else 15)
-        plt.grid(True, linestyle='--', alpha=0.2, color='#444444', linewidth=1)
-        
-        ax.tick_params(axis='x', colors='#a0a0a0', labelsize=6.4)
-        ax.tick_params(axis='y', colors='#a0a0a0', labelsize=6.4)
-        
-        for spine in ax.spines.values():
-            spine.set_color('#333333')
-            spine.set_linewidth(1)
-
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format='png', facecolor='#1a1a1a', edgecolor='none', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    plt.close()
-    
-    return Image.open(buf)
+        user_state = _EMPTY_STATE
+        
+    # The chart depends only on the history, so identical histories (empty and
+    # error paths, repeated renders) reuse the file drawn the first time
+    # The session peak is tracked incrementally in response_generator
+    history = tuple(user_state.get("complexity_history", ()))
+    peak = user_state.get("max_complexity", 0)
+    key = hashlib.blake2b(repr(("trend", history, peak)).encode(), digest_size=16).hexdigest()
+    return _cached_png(key, lambda: _draw_plot(history, peak))
+
+def _draw_plot(history, peak):
+    """Draws the complexity trend for a history tuple."""
+    with _PLOT_LOCK:
+        fig, ax = _plot_figure()
+        ax.clear()
+        
+        if not history:
+            ax.text(0.5, 0.5, 'Awaiting Analysis Request...', 
+                    horizontalalignment='center', verticalalignment='center', 
+                    transform=ax.transAxes, color='#a0a0a0', fontsize=12, fontweight=500)
+            ax.axis('off')
+        else:
+            ax.axis('on')
+            # numpy arrays take matplotlib's vectorized path instead of per-element conversion
+            y = np.fromiter(history, dtype=np.float32, count=len(history))
+            x = np.arange(1, y.size + 1, dtype=np.float32)
+            
+            # Dark mode colors
+            last_score = history[-1]
+            line_color = '#4ade80'  # Green
+            if last_score > 5: line_color = '#fbbf24'  # Amber
+            if last_score > 10: line_color = '#f87171'  # Red
+
+            ax.plot(x, y, marker='o', linestyle='-', color=line_color, linewidth=2.5, markersize=6, markerfacecolor='#1a1a1a', markeredgewidth=2)
+            ax.fill_between(x, y, color=line_color, alpha=0.2)
+            
+            ax.set_title("Code Complexity Trend", color='#e5e5e5', fontsize=8, fontweight=600, pad=3.2)
+            ax.set_xlabel("Analysis #", color='#a0a0a0', fontsize=6.4, fontweight=500)
+            ax.set_ylabel("Complexity Score", color='#a0a0a0', fontsize=6.4, fontweight=500)
+            ax.set_ylim(0, max(peak * 1.15, 15))
+            ax.grid(True, linestyle='--', alpha=0.2, color='#444444', linewidth=1)
+
+        # Do not close the figure: it is reused on the next call
+        # Take the rendered pixels straight from the canvas instead of a PNG
+        # encode/decode round-trip. The RGBA buffer belongs to the shared canvas,
+        # so copy it before the next call redraws over it.
+        canvas = fig.canvas
+        canvas.draw()
+        img = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).copy()
+    
+    return img
+
+# Compiled once at import; rendering is then plain bytecode execution
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+_TEMPLATE_ENV = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(_TEMPLATE_DIR),
+    autoescape=False,
+    auto_reload=False,  # Templates ship with the app; skip the per-render mtime check
+    cache_size=64,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_TPLS = {
+    name: _TEMPLATE_ENV.get_template(name + ".j2")
+    for name in ("stats.html", "dead_code.md", "migration.md", "refactor.md", "duplicate.md", "postmortem.md")
+}
+
+# Severity -> (text color class, icon) for the Code Health card
+_SEV_TABLE = {
+    "LOW": ("text-green-400", "✅"),
+    "MEDIUM": ("text-yellow-400", "⚠️"),
+    "HIGH": ("text-red-400", "🚨"),
+}
+
+@functools.lru_cache(maxsize=64)
+def _render_stats(severity, last_module, max_complexity, msg_count):
+    """Renders the Code Health Monitor; identical stat tuples recur across turns."""
+    text_color, icon = _SEV_TABLE.get(severity, _SEV_TABLE["LOW"])
+
+    return _TPLS["stats.html"].render(
+        severity=severity,
+        icon=icon,
+        text_color=text_color,
+        last_module=last_module,
+        max_complexity=max_complexity,
+        msg_count=msg_count,
+    )
 
 def generate_stats_html(user_state):
     """Generates the HTML for the Code Health Monitor."""
     if user_state is None:
-        user_state = get_empty_state()
-
-    severity = user_state.get("current_severity", "LOW")
-    
-    color_class = "status-green"
-    icon = "✅"
-    bg_color = "#f0fff4"
-    border_color = "#9ae6b4"
-    if severity == "MEDIUM": 
-        color_class = "status-orange"
-        icon = "⚠️"
-        bg_color = "#fffaf0"
-        border_color = "#fbd38d"
-    elif severity == "HIGH": 
-        color_class = "status-red"
-        icon = "🚨"
-        bg_color = "#fff5f5"
-        border_color = "#fc8181"
-
-    # Dark mode color classes
-    color_classes = {
-        "LOW": "bg-green-900/20 border-green-700/50 text-green-400",
-        "MEDIUM": "bg-yellow-900/20 border-yellow-700/50 text-yellow-400",
-        "HIGH": "bg-red-900/20 border-red-700/50 text-red-400"
-    }
-    
-    icons = {
-        "LOW": "✅",
-        "MEDIUM": "⚠️",
-        "HIGH": "🚨"
-    }
-    
-    status_class = color_classes.get(severity, color_classes["LOW"])
-    icon = icons.get(severity, "✅")
-    text_color = "text-green-400" if severity == "LOW" else "text-yellow-400" if severity == "MEDIUM" else "text-red-400"
-
-    return f"""
-    <div class="grid grid-cols-2 gap-2 mb-3">
-        <button type="button" class="w-full bg-[#1a1a1a] border border-[#333333] rounded-md p-3 hover:border-[#3291ff] hover:bg-[#2a2a2a] transition-all text-left cursor-pointer group focus:outline-none focus:ring-2 focus:ring-[#3291ff] focus:ring-offset-1">
-            <div class="text-[10px] font-medium text-[#a0a0a0] uppercase tracking-wide mb-1.5">CODE HEALTH</div>
-            <div class="text-base font-bold {text_color} flex items-center gap-1.5">
-                <span>{icon}</span>
-                <span>{severity}</span>
-            </div>
-        </button>
-        <button type="button" class="w-full bg-[#1a1a1a] border border-[#333333] rounded-md p-3 hover:border-[#3291ff] hover:bg-[#2a2a2a] transition-all text-left cursor-pointer group focus:outline-none focus:ring-2 focus:ring-[#3291ff] focus:ring-offset-1">
-            <div class="text-[10px] font-medium text-[#a0a0a0] uppercase tracking-wide mb-1.5">LAST MODULE</div>
-            <div class="text-base font-bold text-[#e5e5e5] truncate">{user_state.get("last_module", "None").title()}</div>
-        </button>
-        <button type="button" class="w-full bg-[#1a1a1a] border border-[#333333] rounded-md p-3 hover:border-[#3291ff] hover:bg-[#2a2a2a] transition-all text-left cursor-pointer group focus:outline-none focus:ring-2 focus:ring-[#3291ff] focus:ring-offset-1">
-            <div class="text-[10px] font-medium text-[#a0a0a0] uppercase tracking-wide mb-1.5">PEAK COMPLEXITY</div>
-            <div class="text-base font-bold text-[#e5e5e5]">
-                {user_state.get("max_complexity", 0)}<span class="text-xs text-[#a0a0a0] font-normal ml-1">/15</span>
-            </div>
-        </button>
-        <button type="button" class="w-full bg-[#1a1a1a] border border-[#333333] rounded-md p-3 hover:border-[#3291ff] hover:bg-[#2a2a2a] transition-all text-left cursor-pointer group focus:outline-none focus:ring-2 focus:ring-[#3291ff] focus:ring-offset-1">
-            <div class="text-[10px] font-medium text-[#a0a0a0] uppercase tracking-wide mb-1.5">ANALYSES</div>
-            <div class="text-base font-bold text-[#e5e5e5]">{user_state.get("msg_count", 0)}</div>
-        </button>
-    </div>
-    """
+        user_state = _EMPTY_STATE
+
+    return _render_stats(
+        user_state.get("current_severity", "LOW"),
+        user_state.get("last_module", "None").title(),
+        user_state.get("max_complexity", 0),
+        user_state.get("msg_count", 0),
+    )
+
+def _stats_update(user_state):
+    """Returns the Code Health Monitor HTML, or gr.update() if this session already shows it."""
+    key = (
+        user_state.get("current_severity", "LOW"),
+        user_state.get("last_module", "None"),
+        user_state.get("max_complexity", 0),
+        user_state.get("msg_count", 0),
+    )
+    if user_state.get("_stats_key") == key:
+        return gr.update()
+    user_state["_stats_key"] = key
+    return generate_stats_html(user_state)
 
 def _format_dead_code_display(dead_code_data: Dict) -> str:
     """Format dead code data for display."""
@@ -187,34 +312,12 @@ def _format_dead_code_display(dead_code_data: Dict) -> str:
     total_funcs = dead_code_data.get("total_functions", 0)
     total_imports = dead_code_data.get("total_imports", 0)
     
-    md = f"""## Dead Code Analysis
-
-**Summary:**
-- Potentially unused functions: **{len(unused_funcs)}**
-- Potentially unused imports: **{len(unused_imports)}**
-- Total functions analyzed: {total_funcs}
-- Total imports analyzed: {total_imports}
-
-"""
-    
-    if unused_funcs:
-        md += "### Unused Functions\n\n"
-        for func in unused_funcs[:10]:  # Limit to 10
-            md += f"- `{func}`\n"
-        if len(unused_funcs) > 10:
-            md += f"\n*... and {len(unused_funcs) - 10} more*\n"
-    
-    if unused_imports:
-        md += "\n### Unused Imports\n\n"
-        for imp in unused_imports[:10]:  # Limit to 10
-            md += f"- `{imp}`\n"
-        if len(unused_imports) > 10:
-            md += f"\n*... and {len(unused_imports) - 10} more*\n"
-    
-    if not unused_funcs and not unused_imports:
-        md += "✅ No dead code detected!"
-    
-    return md
+    return _TPLS["dead_code.md"].render(
+        unused_funcs=unused_funcs,
+        unused_imports=unused_imports,
+        total_funcs=total_funcs,
+        total_imports=total_imports,
+    )
 
 def _format_migration_display(migration_data: Dict) -> str:
     """Format migration plan for display."""
@@ -237,28 +340,13 @@ The system will analyze your codebase and generate a detailed migration plan wit
     compatibility = migration_data.get("compatibility", "Unknown")
     effort = migration_data.get("estimated_effort", "Medium")
     
-    md = f"""## {plan_title}
-
-**Compatibility:** {compatibility}  
-**Estimated Effort:** {effort}
-
-"""
-    
-    if steps:
-        md += "### Migration Steps\n\n"
-        for i, step in enumerate(steps, 1):
-            md += f"{i}. {step}\n"
-    else:
-        md += "### Migration Steps\n\n*No specific steps defined.*\n"
-    
-    if breaking_changes:
-        md += "\n### Breaking Changes\n\n"
-        for change in breaking_changes:
-            md += f"- ⚠️ {change}\n"
-    else:
-        md += "\n### Breaking Changes\n\n✅ No breaking changes identified.\n"
-    
-    return md
+    return _TPLS["migration.md"].render(
+        plan_title=plan_title,
+        steps=steps,
+        breaking_changes=breaking_changes,
+        compatibility=compatibility,
+        effort=effort,
+    )
 
 def _format_refactor_display(refactor_data: List) -> str:
     """Format refactoring suggestions for display."""
@@ -275,36 +363,7 @@ To get refactoring suggestions, request a refactoring analysis, for example:
 The system will analyze code complexity and provide specific refactoring recommendations.
 """
     
-    md = "## Refactoring Suggestions\n\n"
-    
-    if not refactor_data:
-        md += "✅ No refactoring suggestions needed. Code quality is good!"
-        return md
-    
-    for item in refactor_data:
-        if isinstance(item, dict):
-            file_path = item.get("file", "Unknown")
-            complexity = item.get("complexity", {})
-            suggestions = item.get("suggestions", [])
-            
-            avg_comp = complexity.get("avg_complexity", 0)
-            func_count = complexity.get("function_count", 0)
-            
-            md += f"### `{file_path}`\n\n"
-            md += f"- **Average Complexity:** {avg_comp:.1f}\n"
-            md += f"- **Functions:** {func_count}\n\n"
-            
-            if suggestions:
-                md += "**Suggestions:**\n"
-                for suggestion in suggestions:
-                    md += f"- {suggestion}\n"
-            else:
-                md += "*No specific suggestions for this file.*\n"
-            md += "\n"
-        else:
-            md += f"- {item}\n"
-    
-    return md
+    return _TPLS["refactor.md"].render(items=refactor_data)
 
 def _format_duplicate_display(duplicate_data: Dict) -> str:
     """Format duplicate code data for display."""
@@ -315,34 +374,11 @@ def _format_duplicate_display(duplicate_data: Dict) -> str:
     total = duplicate_data.get("total_duplicates", 0)
     files_analyzed = duplicate_data.get("files_analyzed", 0)
     
-    md = f"""## Duplicate Code Detection
-
-**Summary:**
-- Duplicate blocks found: **{total}**
-- Files analyzed: {files_analyzed}
-
-"""
-    
-    if duplicates:
-        md += "### Duplicate Blocks\n\n"
-        for dup in duplicates[:10]:  # Limit to 10
-            file1 = dup.get("file1", "Unknown")
-            file2 = dup.get("file2", "Unknown")
-            similarity = dup.get("similarity", 0)
-            common_blocks = dup.get("common_blocks", [])
-            
-            md += f"**{file1}** ↔ **{file2}** (Similarity: {similarity:.1%})\n"
-            if common_blocks:
-                total_lines = sum(block.get("lines", 0) for block in common_blocks)
-                md += f"- {len(common_blocks)} common block(s), {total_lines} total lines\n"
-            md += "\n"
-        
-        if len(duplicates) > 10:
-            md += f"\n*... and {len(duplicates) - 10} more duplicate pairs*\n"
-    else:
-        md += "✅ No duplicate code detected!"
-    
-    return md
+    return _TPLS["duplicate.md"].render(
+        duplicates=duplicates,
+        total=total,
+        files_analyzed=files_analyzed,
+    )
 
 def _format_postmortem_display(postmortem_data: Dict) -> str:
     """Format postmortem for display."""
@@ -370,232 +406,162 @@ The system will analyze log files, cluster errors, and generate a structured pos
     clusters = postmortem_data.get("clusters", {})
     anomalies = postmortem_data.get("anomalies", {})
     
-    md = f"""## Incident Postmortem
-
-**Summary:**
-- Errors found: {error_count}
-- Warnings found: {warning_count}
-"""
-    
-    if clusters:
-        cluster_count = len(clusters.get("clusters", []))
-        if cluster_count > 0:
-            md += f"- Error clusters: {cluster_count}\n"
-    
-    if anomalies:
-        anomaly_count = len(anomalies.get("anomalies", []))
-        if anomaly_count > 0:
-            md += f"- Anomalies detected: {anomaly_count}\n"
-    
-    md += "\n"
-    
-    if recommendations:
-        md += "### Recommendations\n\n"
-        for rec in recommendations:
-            md += f"- {rec}\n"
-    else:
-        md += "### Recommendations\n\n*No specific recommendations available.*\n"
-    
-    if error_count == 0 and warning_count == 0:
-        md += "\n✅ **No incidents detected.** System is operating normally.\n"
-    
-    return md
-    
-    md = f"""## Incident Postmortem
-
-**Summary:**
-- Errors: {error_count}
-- Warnings: {warning_count}
-
-### Recommendations
-
-"""
-    for rec in recommendations:
-        md += f"{rec}\n"
-    
-    return md
+    return _TPLS["postmortem.md"].render(
+        error_count=error_count,
+        warning_count=warning_count,
+        recommendations=recommendations,
+        cluster_count=len(clusters.get("clusters", [])) if clusters else 0,
+        anomaly_count=len(anomalies.get("anomalies", [])) if anomalies else 0,
+    )
 
 def get_live_logs():
-    """Reads the last N chars of the log file."""
-    if os.path.exists(LOG_FILE):
-        try:
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                return f.read()[-3000:]
-        except Exception:
-            return "Loading logs..."
-    return "Initializing system logs..."
-
-def response_generator(message, history, user_state, repo_url=None):
+    """Returns the most recent log lines from the in-memory ring buffer."""
+    return "".join(_LOG_RING)
+
+# Log polling interval (seconds): starts fast, doubles per idle tick up to the cap
+LOG_POLL_INTERVAL = 2
+LOG_POLL_MAX_INTERVAL = 30
+
+def _log_poll_interval(idle_ticks):
+    return min(LOG_POLL_MAX_INTERVAL, LOG_POLL_INTERVAL * 2 ** idle_ticks)
+
+def poll_live_logs(poll_state):
+    """Timer handler: sends the log tail only when new lines arrived, backing off while idle."""
+    if poll_state is None:
+        poll_state = {"seq": None, "idle": 0}
+    seq = _LOG_SEQ
+    idle = poll_state["idle"]
+    if poll_state["seq"] == seq:
+        # Nothing new: leave the textarea alone and poll less often
+        poll_state["idle"] = idle + 1
+        interval = _log_poll_interval(idle + 1)
+        timer_update = gr.Timer(value=interval) if interval != _log_poll_interval(idle) else gr.update()
+        return gr.update(), poll_state, timer_update
+    poll_state["seq"] = seq
+    poll_state["idle"] = 0
+    timer_update = gr.Timer(value=LOG_POLL_INTERVAL) if idle else gr.update()
+    return get_live_logs(), poll_state, timer_update
+
+def trim_chat_history(history, user_state):
+    """Moves messages beyond the session's chat window into its archive."""
+    window = user_state.get("chat_window", CHAT_MAX_MESSAGES)
+    if len(history) <= window:
+        return gr.update(), user_state, gr.update()
+    cut = len(history) - window
+    user_state["chat_archive"].extend(history[:cut])
+    return history[cut:], user_state, gr.Button(visible=True)
+
+def load_older_messages(history, user_state):
+    """Prepends the next batch of archived messages to the chat window."""
+    archive = user_state["chat_archive"]
+    batch = archive[-CHAT_LOAD_BATCH:]
+    del archive[-CHAT_LOAD_BATCH:]
+    # Widen the window so the restored messages are not trimmed again this turn
+    user_state["chat_window"] = len(history) + len(batch)
+    return batch + history, user_state, gr.Button(visible=bool(archive))
+
+# How long a turn waits for its charts before sending the reply on its own
+STREAM_COALESCE_SECONDS = 0.05
+
+def _chart_paths(user_state, *images):
+    """Returns the trend chart path followed by the cached PNG path of each image."""
+    return [generate_plot(user_state)] + [_image_path(img) for img in images]
+
+def _unless_unchanged(user_state, slot, value):
+    """Returns gr.update() if this session was last sent the same value for slot, else value.
+
+    Values are chart paths or report markdown; only a digest is kept in the session.
+    """
+    digest = None if value is None else hashlib.blake2b(value.encode(), digest_size=16).digest()
+    sent = user_state.setdefault("_output_digests", {})
+    if slot in sent and sent[slot] == digest:
+        return gr.update()
+    sent[slot] = digest
+    return value
+
+@dataclass
+class TurnOutputs:
+    """One response_generator update, in ChatInterface output order.
+
+    Fields left unset are gr.update(), which keeps the component's current value
+    and sends nothing for it.
+    """
+    message: str  # Message string (for chatbot)
+    state: Dict  # State update
+    plot: Any = field(default_factory=gr.update)  # Plot image
+    stats: Any = field(default_factory=gr.update)  # Stats HTML
+    dep_graph: Any = field(default_factory=gr.update)  # Dependency graph image
+    heatmap: Any = field(default_factory=gr.update)  # Heatmap image
+    timeline: Any = field(default_factory=gr.update)  # Timeline image
+    dead_code: Any = field(default_factory=gr.update)  # Dead code markdown
+    migration: Any = field(default_factory=gr.update)  # Migration markdown
+    refactor: Any = field(default_factory=gr.update)  # Refactor markdown
+    duplicate: Any = field(default_factory=gr.update)  # Duplicate markdown
+    postmortem: Any = field(default_factory=gr.update)  # Postmortem markdown
+
+    def as_tuple(self):
+        # Not dataclasses.astuple: that would deep-copy the images and session state
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+async def response_generator(message, history, user_state, repo_url=None):
     """
-    Generator function for ChatInterface.
+    Async generator function for ChatInterface.
     Uses gr.State (user_state) to keep data separate for every user.
     """
     if user_state is None:
         user_state = get_empty_state()
 
     if not message:
-        # Return empty message with default values for all outputs
-        empty_plot = generate_plot(user_state)
-        empty_stats = generate_stats_html(user_state)
-        yield (
-            "",  # Message (string only for chatbot)
-            user_state,  # State
-            empty_plot,  # Plot image
-            empty_stats,  # Stats HTML
-            None,  # Dep graph
-            None,  # Heatmap
-            None,  # Timeline
-            "Run repository analysis to see dead code report.",  # Dead code
-            "Ask for migration analysis to see plans.",  # Migration
-            "Request refactoring analysis for suggestions.",  # Refactor
-            "Run repository analysis to see duplicate code detection.",  # Duplicates
-            "Analyze logs to generate postmortem."  # Postmortem
-        )
+        # Nothing changed: gr.update() leaves every output as it is on screen
+        yield TurnOutputs("", user_state).as_tuple()
         return
         
+    # A new turn shrinks a widened chat window back to its default size
+    user_state["chat_window"] = CHAT_MAX_MESSAGES
+
     try:
-        # Update GitHub token from environment if available
-        github_token = os.getenv("GITHUB_TOKEN")
-        if github_token:
-            from project.config import Config
-            Config.GITHUB_TOKEN = github_token
-        
-        # Run the agent with optional repository URL
-        result_dict = agent_instance.handle_message(message, repo_url=repo_url)
-        response_text = result_dict.get("response", "Error: No response text found.")
+        # Run the agent with optional repository URL and this session's GitHub token
+        # The agent blocks on LLM, GitHub and repository I/O; run it off the event loop
+        result = await asyncio.to_thread(
+            agent_instance.run, message, repo_url=repo_url, github_token=user_state.get("github_token")
+        )
+        response_text = result.response or "Error: No response text found."
         
         # Extract metadata
-        plan = result_dict.get('plan', {})
+        plan = result.plan
         action = plan.get('action')
         severity = plan.get('risk_level', 'LOW')  # Map risk_level to severity
         complexity = plan.get('complexity', 'LOW')
         task_type = plan.get('task_type', action)
-        safety_status = result_dict.get("safety_status")
+        safety_status = result.safety_status
         
         # Extract visualizations
-        visualizations = result_dict.get("visualizations", {})
+        visualizations = result.visualizations
         dep_graph_img = visualizations.get("dependency_graph_image")
         heatmap_img = visualizations.get("complexity_heatmap")
         
         # Debug logging for visualization extraction
         if dep_graph_img:
-            logger.info(f"Dependency graph image extracted: {type(dep_graph_img)}, has save method: {hasattr(dep_graph_img, 'save')}")
+            logger.opt(lazy=True).debug("Dependency graph image extracted: {}, has save method: {}", lambda: type(dep_graph_img), lambda: hasattr(dep_graph_img, 'save'))
         else:
-            logger.info(f"No dependency graph image found in visualizations. Keys: {list(visualizations.keys())}")
+            logger.opt(lazy=True).debug("No dependency graph image found in visualizations. Keys: {}", lambda: list(visualizations.keys()))
         
         if heatmap_img:
-            logger.info(f"Complexity heatmap image extracted: {type(heatmap_img)}, has save method: {hasattr(heatmap_img, 'save')}")
+            logger.opt(lazy=True).debug("Complexity heatmap image extracted: {}, has save method: {}", lambda: type(heatmap_img), lambda: hasattr(heatmap_img, 'save'))
         else:
-            logger.info(f"No complexity heatmap image found in visualizations. Keys: {list(visualizations.keys())}")
-        timeline_img = None
-        # Check for timeline in visualizations (direct key)
-        if "error_timeline" in visualizations:
-            timeline_img = visualizations["error_timeline"]
-            logger.info(f"Found error_timeline in visualizations: {type(timeline_img)}")
-        else:
-            # Find timeline in log results (could be in nested structure)
-            for key, value in visualizations.items():
-                # Skip if value is a PIL Image (don't treat it as dict)
-                if hasattr(value, 'save'):  # Direct PIL Image
-                    if "timeline" in str(key).lower():
-                        timeline_img = value
-                        logger.info(f"Found timeline as direct value: {key}")
-                        break
-                elif isinstance(value, dict):
-                    for sub_key, sub_value in value.items():
-                        # Check if sub_value is a PIL Image
-                        if hasattr(sub_value, 'save'):  # PIL Image
-                            if "_timeline" in sub_key or "timeline" in str(sub_key).lower():
-                                timeline_img = sub_value
-                                logger.info(f"Found timeline in nested structure: {sub_key}")
-                                break
-                        elif isinstance(sub_value, dict) and "timeline" in str(sub_value):
-                            # Nested dict with timeline key
-                            if "timeline" in sub_value:
-                                timeline_val = sub_value.get("timeline")
-                                if hasattr(timeline_val, 'save'):
-                                    timeline_img = timeline_val
-                                    logger.info(f"Found timeline in deeply nested structure: {key}.{sub_key}")
-                                    break
+            logger.opt(lazy=True).debug("No complexity heatmap image found in visualizations. Keys: {}", lambda: list(visualizations.keys()))
+        # MainAgent has already lifted any nested timeline into this key
+        timeline_img = visualizations.get("error_timeline")
         
         if not timeline_img:
-            logger.info(f"No timeline image found. Visualization keys: {list(visualizations.keys())}")
-        
-        # Extract structured data for tabs - check multiple sources
-        dead_code_data = result_dict.get("dead_code_report", {})
-        migration_data = result_dict.get("migration_plan_report", {})
-        refactor_data = result_dict.get("refactor_suggestions_report", [])
-        duplicate_data = result_dict.get("duplicate_code_report", {})
-        postmortem_data = result_dict.get("postmortem_report", {})
+            logger.opt(lazy=True).debug("No timeline image found. Visualization keys: {}", lambda: list(visualizations.keys()))
         
-        # Fallback: check visualizations dict
-        if not dead_code_data:
-            dead_code_data = visualizations.get("dead_code", {})
-        if not migration_data:
-            migration_data = visualizations.get("migration_plan", {})
-        if not refactor_data:
-            refactor_data = visualizations.get("refactor_suggestions", [])
-        if not duplicate_data:
-            duplicate_data = visualizations.get("duplicates", {})
-        if not postmortem_data:
-            postmortem_data = visualizations.get("postmortem", {})
-        
-        # Fallback: check nested structures in visualizations
-        # IMPORTANT: Skip PIL Image objects - they don't have .get() method
-        for key, value in visualizations.items():
-            # Skip if value is a PIL Image (has 'save' method) - don't treat as dict
-            if hasattr(value, 'save'):
-                continue  # This is an image, not a dict
-            elif isinstance(value, dict):
-                if "dead_code" in value and not dead_code_data:
-                    dead_code_data = value.get("dead_code", {})
-                if "migration_plan" in value and not migration_data:
-                    migration_data = value.get("migration_plan", {})
-                if "refactor_suggestions" in value and not refactor_data:
-                    refactor_data = value.get("refactor_suggestions", [])
-                if "duplicates" in value and not duplicate_data:
-                    duplicate_data = value.get("duplicates", {})
-                if "postmortem" in value and not postmortem_data:
-                    postmortem_data = value.get("postmortem", {})
-        
-        # Final fallback: check analysis_results directly from worker
-        if hasattr(agent_instance, 'worker') and hasattr(agent_instance.worker, '_last_analysis_results'):
-            analysis_results = agent_instance.worker._last_analysis_results
-            if isinstance(analysis_results, dict):
-                # Extract reports, but skip PIL Image objects
-                for key, value in analysis_results.items():
-                    # Skip PIL Image objects - they don't have .get() method
-                    if hasattr(value, 'save'):
-                        continue  # This is an image, not a dict
-                    elif isinstance(value, dict):
-                        if not dead_code_data and "dead_code" in value:
-                            dead_code_data = value.get("dead_code", {})
-                        if not migration_data and "migration_plan" in value:
-                            migration_data = value.get("migration_plan", {})
-                        if not refactor_data and "refactor_suggestions" in value:
-                            refactor_data = value.get("refactor_suggestions", [])
-                        if not duplicate_data and "duplicates" in value:
-                            duplicate_data = value.get("duplicates", {})
-                        if not postmortem_data and "postmortem" in value:
-                            postmortem_data = value.get("postmortem", {})
-                
-                # Also check top-level keys (if not already found) - but verify they're not images
-                if not dead_code_data and "dead_code" in analysis_results:
-                    val = analysis_results["dead_code"]
-                    if isinstance(val, dict) and not hasattr(val, 'save'):
-                        dead_code_data = val
-                if not migration_data and "migration_plan" in analysis_results:
-                    val = analysis_results["migration_plan"]
-                    if isinstance(val, dict) and not hasattr(val, 'save'):
-                        migration_data = val
-                if not refactor_data and "refactor_suggestions" in analysis_results:
-                    val = analysis_results["refactor_suggestions"]
-                    if isinstance(val, list) and not hasattr(val, 'save'):
-                        refactor_data = val
-                if not duplicate_data and "duplicates" in analysis_results:
-                    val = analysis_results["duplicates"]
-                    if isinstance(val, dict) and not hasattr(val, 'save'):
-                        duplicate_data = val
+        # Structured data for tabs; AgentResult always carries every report
+        dead_code_data = result.dead_code_report
+        migration_data = result.migration_plan_report
+        refactor_data = result.refactor_suggestions_report
+        duplicate_data = result.duplicate_code_report
+        postmortem_data = result.postmortem_report
         
         # Update State - map complexity to numeric score
         try:
@@ -613,8 +579,8 @@ def response_generator(message, history, user_state, repo_url=None):
         # Extract module name from target_paths if available
         target_paths = plan.get('target_paths', [])
         if target_paths:
-            last_path = target_paths[0]
-            user_state["last_module"] = last_path.split('/')[-1] if '/' in last_path else last_path.split('\\')[-1] if '\\' in last_path else last_path
+            # ntpath splits on both separators, so Windows-style paths from analyzed repos work on POSIX too
+            user_state["last_module"] = ntpath.basename(target_paths[0])
         else:
             user_state["last_module"] = task_type.replace('_', ' ').title() if task_type else "None"
         user_state["max_complexity"] = max(user_state["max_complexity"], current_score)
@@ -631,9 +597,6 @@ def response_generator(message, history, user_state, repo_url=None):
         
         final_response = prefix + response_text
         
-        # Prepare visualization outputs (use None if not available)
-        plot_img = generate_plot(user_state)
-        
         # Ensure PIL Images are properly formatted for Gradio
         dep_graph = dep_graph_img if dep_graph_img and hasattr(dep_graph_img, 'save') else None
         heatmap = heatmap_img if heatmap_img and hasattr(heatmap_img, 'save') else None
@@ -641,20 +604,29 @@ def response_generator(message, history, user_state, repo_url=None):
         
         # Debug: Log visualization status
         if dep_graph:
-            logger.info(f"Dependency graph ready: {type(dep_graph)}, size: {dep_graph.size if hasattr(dep_graph, 'size') else 'unknown'}")
+            logger.opt(lazy=True).debug("Dependency graph ready: {}, size: {}", lambda: type(dep_graph), lambda: getattr(dep_graph, 'size', 'unknown'))
         else:
-            logger.info(f"No dependency graph image available. dep_graph_img type: {type(dep_graph_img)}")
+            logger.opt(lazy=True).debug("No dependency graph image available. dep_graph_img type: {}", lambda: type(dep_graph_img))
         
         if heatmap:
-            logger.info(f"Complexity heatmap ready: {type(heatmap)}, size: {heatmap.size if hasattr(heatmap, 'size') else 'unknown'}")
+            logger.opt(lazy=True).debug("Complexity heatmap ready: {}, size: {}", lambda: type(heatmap), lambda: getattr(heatmap, 'size', 'unknown'))
         else:
-            logger.info(f"No complexity heatmap image available. heatmap_img type: {type(heatmap_img)}")
+            logger.opt(lazy=True).debug("No complexity heatmap image available. heatmap_img type: {}", lambda: type(heatmap_img))
         
         if timeline:
-            logger.info(f"Error timeline ready: {type(timeline)}, size: {timeline.size if hasattr(timeline, 'size') else 'unknown'}")
+            logger.opt(lazy=True).debug("Error timeline ready: {}, size: {}", lambda: type(timeline), lambda: getattr(timeline, 'size', 'unknown'))
         else:
-            logger.info(f"No error timeline image available. timeline_img type: {type(timeline_img)}")
+            logger.opt(lazy=True).debug("No error timeline image available. timeline_img type: {}", lambda: type(timeline_img))
         
+        # Draw the trend chart and cache the analysis charts off the event loop
+        charts = asyncio.ensure_future(asyncio.to_thread(_chart_paths, user_state, dep_graph, heatmap, timeline))
+        # Cached charts are ready almost at once: then the reply and the dashboard
+        # go out in one update. Otherwise show the reply now and the rest after.
+        done, _ = await asyncio.wait({charts}, timeout=STREAM_COALESCE_SECONDS)
+        if not done:
+            yield TurnOutputs(final_response, user_state, stats=_stats_update(user_state)).as_tuple()
+        plot_img, dep_graph, heatmap, timeline = await charts
+
         # Format data for display tabs
         dead_code_md = _format_dead_code_display(dead_code_data)
         migration_md = _format_migration_display(migration_data)
@@ -662,58 +634,69 @@ def response_generator(message, history, user_state, repo_url=None):
         duplicate_md = _format_duplicate_display(duplicate_data)
         postmortem_md = _format_postmortem_display(postmortem_data)
         
-        # Yield result with all outputs
-        # First element must be the message string for the chatbot component
-        # Remaining elements correspond to additional_outputs in order
-        yield (
-            final_response,  # Message string (for chatbot)
-            user_state,  # State update
-            plot_img,  # Plot image
-            generate_stats_html(user_state),  # Stats HTML
-            dep_graph,  # Dependency graph image
-            heatmap,  # Heatmap image
-            timeline,  # Timeline image
-            dead_code_md,  # Dead code markdown
-            migration_md,  # Migration markdown
-            refactor_md,  # Refactor markdown
-            duplicate_md,  # Duplicate markdown
-            postmortem_md  # Postmortem markdown
-        )
+        yield TurnOutputs(
+            final_response,
+            user_state,
+            plot=plot_img,
+            stats=_stats_update(user_state),
+            dep_graph=_unless_unchanged(user_state, "dep_graph", dep_graph),
+            heatmap=_unless_unchanged(user_state, "heatmap", heatmap),
+            timeline=_unless_unchanged(user_state, "timeline", timeline),
+            dead_code=_unless_unchanged(user_state, "dead_code", dead_code_md),
+            migration=_unless_unchanged(user_state, "migration", migration_md),
+            refactor=_unless_unchanged(user_state, "refactor", refactor_md),
+            duplicate=_unless_unchanged(user_state, "duplicate", duplicate_md),
+            postmortem=_unless_unchanged(user_state, "postmortem", postmortem_md),
+        ).as_tuple()
 
     except Exception as e:
         logger.error(f"Runtime Error: {e}")
-        error_plot = generate_plot(user_state)
-        error_stats = generate_stats_html(user_state)
-        yield (
-            f"System Error: {str(e)}",  # Error message (string)
-            user_state,  # State
-            error_plot,  # Plot image
-            error_stats,  # Stats HTML
-            None,  # Dep graph
-            None,  # Heatmap
-            None,  # Timeline
-            "Error loading dead code data.",  # Dead code
-            "Error loading migration data.",  # Migration
-            "Error loading refactoring data.",  # Refactor
-            "Error loading duplicate code data.",  # Duplicates
-            "Error loading postmortem data."  # Postmortem
-        )
+        # Keep the last good charts and reports; only the chat shows the error
+        yield TurnOutputs(f"System Error: {str(e)}", user_state).as_tuple()
 
 # --- 4. UI LAYOUT ---
 
-with gr.Blocks(title="AutoPilot DevOps") as demo:
+LOGS_TAB_LABEL = "📋 Logs"
+
+# Material Design stylesheet, served as a static file the browser can cache
+_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "project", "static", "app.css")
+# Fonts load from <head> without blocking first paint; only the weights the
+# stylesheet, templates and rendered Markdown actually use are requested
+_FONTS_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap"
+_HEAD = f"""
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="preload" as="style" href="{_FONTS_URL}">
+<link rel="stylesheet" href="{_FONTS_URL}">
+"""
+
+def tab_header(title, subtitle=None, spaced=False):
+    """Renders a dashboard section heading; its styles live in the .tab-header CSS rules."""
+    classes = "tab-header tab-header-spaced" if spaced else "tab-header"
+    body = f"<h3>{html.escape(title)}</h3>"
+    if subtitle:
+        body += f"<p>{html.escape(subtitle)}</p>"
+    return gr.HTML(f'<div class="{classes}">{body}</div>')
+
+# No "Use via API" link: every event is UI-only, so there is no API page to build
+_FOOTER_LINKS = ["gradio", "settings"]
+
+with gr.Blocks(title="AutoPilot DevOps", analytics_enabled=False) as demo:
     
     # State management for independent user sessions
+    # gr.State deep-copies this value for every new session
     user_session = gr.State(value=get_empty_state())
 
     # 1. Initialization of Dynamic Output Components
-    plot_output = gr.Image(label="Code Metrics Trend", type="pil", elem_id="plot_panel", interactive=False, render=False)
-    stats_output = gr.HTML(value=generate_stats_html(get_empty_state()), elem_id="stats_panel", render=False)
+    # Charts are flat-color line art: lossless PNG encodes about twice as fast as
+    # Gradio's default WebP for these images and keeps text sharp
+    plot_output = gr.Image(label="Code Metrics Trend", type="filepath", elem_id="plot_panel", interactive=False, render=False)
+    stats_output = gr.HTML(value=generate_stats_html(_EMPTY_STATE), elem_id="stats_panel", render=False)
     
     # New visualization outputs
-    dep_graph_output = gr.Image(label="Dependency Graph", type="pil", elem_id="dep_graph_panel", interactive=False, render=False)
-    heatmap_output = gr.Image(label="Complexity Heatmap", type="pil", elem_id="heatmap_panel", interactive=False, render=False)
-    timeline_output = gr.Image(label="Error Timeline", type="pil", elem_id="timeline_panel", interactive=False, render=False)
+    dep_graph_output = gr.Image(label="Dependency Graph", type="filepath", elem_id="dep_graph_panel", interactive=False, render=False)
+    heatmap_output = gr.Image(label="Complexity Heatmap", type="filepath", elem_id="heatmap_panel", interactive=False, render=False)
+    timeline_output = gr.Image(label="Error Timeline", type="filepath", elem_id="timeline_panel", interactive=False, render=False)
     
     # Data display outputs for tabs
     dead_code_output = gr.Markdown(value="Run repository analysis to see dead code report.", elem_id="dead_code_display", render=False)
@@ -722,311 +705,7 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
     duplicate_output = gr.Markdown(value="Run repository analysis to see duplicate code detection.", elem_id="duplicate_display", render=False)
     postmortem_output = gr.Markdown(value="Analyze logs to generate postmortem.", elem_id="postmortem_display", render=False)
 
-    # 2. Material Design UI with Vercel-like Aesthetics
-    gr.HTML("""
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500&display=swap" rel="stylesheet">
-    <link href="https://fonts.googleapis.com/icon?family=Material+Icons" rel="stylesheet">
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500&display=swap');
-        
-        * { 
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }
-        
-        /* Material Design Color Palette - Dark Mode */
-        :root {
-            --md-primary: #3291ff;
-            --md-primary-dark: #0070f3;
-            --md-primary-light: #66b3ff;
-            --md-surface: #1a1a1a;
-            --md-background: #0a0a0a;
-            --md-surface-variant: #2a2a2a;
-            --md-on-surface: #e5e5e5;
-            --md-on-surface-variant: #a0a0a0;
-            --md-border: #333333;
-            --md-shadow: rgba(0, 0, 0, 0.3);
-            --md-elevation-1: 0 1px 3px rgba(0, 0, 0, 0.4), 0 1px 2px rgba(0, 0, 0, 0.5);
-            --md-elevation-2: 0 3px 6px rgba(0, 0, 0, 0.5), 0 3px 6px rgba(0, 0, 0, 0.6);
-            --md-elevation-4: 0 10px 20px rgba(0, 0, 0, 0.6), 0 6px 6px rgba(0, 0, 0, 0.7);
-        }
-        
-        body, .gradio-container {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif !important;
-            background: var(--md-background) !important;
-            color: var(--md-on-surface) !important;
-            line-height: 1.6;
-        }
-        
-        .gradio-container {
-            background: var(--md-background) !important;
-            padding: 0 !important;
-            min-height: 100vh;
-        }
-        
-        /* Material Design Chatbot */
-        .gradio-chatbot {
-            border-radius: 12px !important;
-            border: 1px solid var(--md-border) !important;
-            background: var(--md-surface) !important;
-            padding: 16px !important;
-            box-shadow: var(--md-elevation-1) !important;
-            transition: box-shadow 0.3s ease !important;
-        }
-        
-        .gradio-chatbot:hover {
-            box-shadow: var(--md-elevation-2) !important;
-        }
-        
-        .gradio-chatbot > div:first-child {
-            height: 10rem !important;
-            max-height: 10rem !important;
-        }
-        
-        .gradio-chatbot .chat-messages,
-        .gradio-chatbot [class*="message-container"],
-        .gradio-chatbot [class*="chat-history"] {
-            max-height: 7.5rem !important;
-        }
-        
-        /* Material Design Example Buttons */
-        .gradio-chatbot .examples {
-            gap: 8px !important;
-            margin-bottom: 12px !important;
-            display: flex !important;
-            flex-wrap: wrap !important;
-        }
-        
-        .gradio-chatbot .examples button {
-            padding: 8px 16px !important;
-            font-size: 13px !important;
-            border-radius: 8px !important;
-            border: 1px solid var(--md-border) !important;
-            background: var(--md-surface) !important;
-            color: var(--md-on-surface) !important;
-            font-weight: 500 !important;
-            transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1) !important;
-            height: auto !important;
-            min-height: auto !important;
-            cursor: pointer !important;
-            text-transform: none !important;
-            letter-spacing: 0 !important;
-        }
-        
-        .gradio-chatbot .examples button:hover {
-            background: var(--md-surface-variant) !important;
-            border-color: var(--md-primary) !important;
-            color: var(--md-primary) !important;
-            transform: translateY(-2px) !important;
-            box-shadow: var(--md-elevation-1) !important;
-        }
-        
-        .gradio-chatbot .examples button:active {
-            transform: translateY(0) !important;
-        }
-        
-        /* Material Design Input Fields */
-        input[type="text"], textarea {
-            border: 1px solid var(--md-border) !important;
-            border-radius: 8px !important;
-            padding: 12px 16px !important;
-            font-size: 14px !important;
-            height: 48px !important;
-            min-height: 48px !important;
-            background: var(--md-surface) !important;
-            color: var(--md-on-surface) !important;
-            transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        }
-        
-        input[type="text"]:focus, textarea:focus {
-            outline: none !important;
-            border-color: var(--md-primary) !important;
-            box-shadow: 0 0 0 3px rgba(0, 112, 243, 0.1) !important;
-        }
-        
-        input[type="text"]::placeholder, textarea::placeholder {
-            color: var(--md-on-surface-variant) !important;
-            opacity: 0.6 !important;
-        }
-        
-        /* Material Design Buttons */
-        button.primary,
-        .gradio-button.primary {
-            background: var(--md-primary) !important;
-            color: white !important;
-            font-weight: 500 !important;
-            padding: 12px 24px !important;
-            border-radius: 8px !important;
-            font-size: 14px !important;
-            height: 48px !important;
-            min-height: 48px !important;
-            border: none !important;
-            text-transform: none !important;
-            letter-spacing: 0 !important;
-            transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1) !important;
-            box-shadow: var(--md-elevation-1) !important;
-            cursor: pointer !important;
-        }
-        
-        button.primary:hover,
-        .gradio-button.primary:hover {
-            background: var(--md-primary-dark) !important;
-            transform: translateY(-2px) !important;
-            box-shadow: var(--md-elevation-2) !important;
-        }
-        
-        button.primary:active,
-        .gradio-button.primary:active {
-            transform: translateY(0) !important;
-            box-shadow: var(--md-elevation-1) !important;
-        }
-        
-        /* Material Design Tabs */
-        .gradio-tabs {
-            background: var(--md-surface) !important;
-            border: 1px solid var(--md-border) !important;
-            border-radius: 12px !important;
-            padding: 4px !important;
-            box-shadow: var(--md-elevation-1) !important;
-            display: flex !important;
-            gap: 4px !important;
-        }
-        
-        .gradio-tabs button {
-            border-radius: 8px !important;
-            padding: 10px 16px !important;
-            font-weight: 500 !important;
-            font-size: 13px !important;
-            height: auto !important;
-            min-height: auto !important;
-            transition: all 0.2s cubic-bezier(0.4, 0, 0.2, 1) !important;
-            color: var(--md-on-surface-variant) !important;
-            background: transparent !important;
-            border: none !important;
-            text-transform: none !important;
-            cursor: pointer !important;
-        }
-        
-        .gradio-tabs button:hover {
-            background: var(--md-surface-variant) !important;
-            color: var(--md-on-surface) !important;
-        }
-        
-        .gradio-tabs button.selected {
-            background: var(--md-primary) !important;
-            color: white !important;
-            box-shadow: var(--md-elevation-1) !important;
-        }
-        
-        /* Material Design Accordion */
-        .gradio-accordion {
-            border: 1px solid var(--md-border) !important;
-            border-radius: 12px !important;
-            background: var(--md-surface) !important;
-            box-shadow: var(--md-elevation-1) !important;
-            overflow: hidden !important;
-        }
-        
-        .gradio-accordion:hover {
-            box-shadow: var(--md-elevation-2) !important;
-        }
-        
-        /* Logs */
-        #log_panel textarea {
-            background: #1f2937 !important;
-            color: #4ade80 !important;
-            font-family: 'JetBrains Mono', monospace !important;
-            font-size: 0.6875rem !important;
-            border: 1px solid #374151 !important;
-            border-radius: 0.5rem !important;
-            padding: 0.75rem !important;
-            height: 400px !important;
-            min-height: 400px !important;
-            max-height: 400px !important;
-            width: 100% !important;
-            resize: none !important;
-            overflow-y: auto !important;
-        }
-        
-        /* Material Design Cards for Visualizations */
-        #plot_panel, #dep_graph_panel, #heatmap_panel, #timeline_panel {
-            background: var(--md-surface) !important;
-            border: 1px solid var(--md-border) !important;
-            border-radius: 12px !important;
-            padding: 16px !important;
-            box-shadow: var(--md-elevation-1) !important;
-            transition: box-shadow 0.3s ease !important;
-        }
-        
-        #plot_panel:hover, #dep_graph_panel:hover, #heatmap_panel:hover, #timeline_panel:hover {
-            box-shadow: var(--md-elevation-2) !important;
-        }
-        
-        #plot_panel img, #dep_graph_panel img, #heatmap_panel img, #timeline_panel img {
-            border-radius: 8px !important;
-            max-width: 100% !important;
-            height: auto !important;
-        }
-        
-        /* Scrollbar - Dark Mode */
-        ::-webkit-scrollbar { width: 0.375rem; height: 0.375rem; }
-        ::-webkit-scrollbar-track { background: #1a1a1a; }
-        ::-webkit-scrollbar-thumb { background: #444444; border-radius: 0.25rem; }
-        ::-webkit-scrollbar-thumb:hover { background: #555555; }
-        
-        /* Markdown - Dark Mode */
-        .markdown { color: #e5e5e5; line-height: 1.6; }
-        .markdown code {
-            background: #2a2a2a;
-            padding: 0.125rem 0.375rem;
-            border-radius: 0.25rem;
-            font-family: 'JetBrains Mono', monospace;
-            font-size: 0.875em;
-            color: #ff6b6b;
-        }
-        
-        /* Description text - Dark Mode */
-        .gradio-chatbot .description {
-            font-size: 0.75rem !important;
-            color: #a0a0a0 !important;
-            margin-bottom: 0.5rem !important;
-        }
-        
-        /* Dark mode for all Gradio components */
-        .gradio-container > div {
-            background: var(--md-background) !important;
-        }
-        
-        /* Chat messages dark mode */
-        .gradio-chatbot .message {
-            background: var(--md-surface) !important;
-            color: var(--md-on-surface) !important;
-        }
-        
-        /* Labels dark mode */
-        label {
-            color: var(--md-on-surface) !important;
-        }
-        
-        /* Markdown content areas */
-        .markdown-body, [class*="markdown"] {
-            background: var(--md-surface) !important;
-            color: var(--md-on-surface) !important;
-        }
-        
-        /* Dead code, migration, refactor, duplicate, postmortem panels */
-        #dead_code_display, #migration_display, #refactor_display, 
-        #duplicate_display, #postmortem_display {
-            background: var(--md-surface) !important;
-            color: var(--md-on-surface) !important;
-            padding: 16px !important;
-            border-radius: 8px !important;
-        }
-    </style>
-    """)
-
-    # 3. Material Design Header (Vercel-style)
+    # 2. Material Design Header (Vercel-style)
     with gr.Row(elem_classes="w-full"):
         gr.HTML("""
         <div style="width: 100%; background: var(--md-surface); border-bottom: 1px solid var(--md-border); padding: 20px 24px; box-shadow: var(--md-elevation-1);">
@@ -1047,7 +726,7 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
         </div>
         """)
 
-    # 4. Main Content Area - Compact Design
+    # 3. Main Content Area - Compact Design
     with gr.Row(elem_classes="max-w-7xl mx-auto px-4 py-4 gap-4"):
         
         # LEFT: Chat Interface
@@ -1072,6 +751,9 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
                     )
                 repo_status = gr.Markdown("**Status:** Ready", elem_classes="text-xs text-gray-500")
             
+            # Only shown once older messages have been trimmed from the chat
+            load_older_btn = gr.Button("⬆️ Load older messages", size="sm", visible=False)
+
             # Chat Interface
             chat_interface = gr.ChatInterface(
                 fn=response_generator,
@@ -1089,100 +771,77 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
                     ["Migrate Flask to FastAPI", None],
                     ["Refactor main_agent.py", None]
                 ],
-                cache_examples=False  # Disable example caching to avoid tuple serialization issues
+                cache_examples=False,  # Disable example caching to avoid tuple serialization issues
+                # The dashboard is the only client; no /chat endpoint or schema entry
+                api_visibility="private"
+            )
+
+            # Long sessions keep a bounded number of messages in the DOM.
+            # chatbot_state is synced after every turn; chatbot_value is the
+            # supported way to replace what the chatbot displays.
+            chat_interface.chatbot_state.change(
+                trim_chat_history,
+                [chat_interface.chatbot_state, user_session],
+                [chat_interface.chatbot_value, user_session, load_older_btn],
+                queue=False,
+                api_visibility="private"
+            )
+            load_older_btn.click(
+                load_older_messages,
+                [chat_interface.chatbot_state, user_session],
+                [chat_interface.chatbot_value, user_session, load_older_btn],
+                queue=False,
+                api_visibility="private"
             )
         
         # RIGHT: Material Design Dashboard with All Tabs
         with gr.Column(scale=2, elem_classes="space-y-3"):
-            with gr.Tabs():
+            with gr.Tabs() as dashboard_tabs:
                 # Tab 1: Analytics
                 with gr.TabItem("📊 Analytics"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Code Health Metrics</h3>
-                    </div>
-                    """)
+                    tab_header("Code Health Metrics")
                     stats_output.render()
                     
-                    gr.HTML("""
-                    <div style="margin-top: 24px; margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Complexity Trend</h3>
-                    </div>
-                    """)
+                    tab_header("Complexity Trend", spaced=True)
                     plot_output.render()
                 
                 # Tab 2: Dependency Graph
                 with gr.TabItem("🔗 Dependencies"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Module Dependency Graph</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Visual representation of code dependencies</p>
-                    </div>
-                    """)
+                    tab_header("Module Dependency Graph", "Visual representation of code dependencies")
                     dep_graph_output.render()
                 
                 # Tab 3: Complexity Heatmap
                 with gr.TabItem("🔥 Hotspots"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Code Complexity Heatmap</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">High-complexity modules requiring attention</p>
-                    </div>
-                    """)
+                    tab_header("Code Complexity Heatmap", "High-complexity modules requiring attention")
                     heatmap_output.render()
                 
                 # Tab 4: Dead Code
                 with gr.TabItem("🧹 Dead Code"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Unused Code Detection</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Potentially unused functions and imports</p>
-                    </div>
-                    """)
+                    tab_header("Unused Code Detection", "Potentially unused functions and imports")
                     dead_code_output.render()
                 
                 # Tab 5: Migration
                 with gr.TabItem("🔄 Migration"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Framework Migration Plans</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Migration strategies and breaking changes</p>
-                    </div>
-                    """)
+                    tab_header("Framework Migration Plans", "Migration strategies and breaking changes")
                     migration_output.render()
                 
                 # Tab 6: Refactoring
                 with gr.TabItem("♻️ Refactoring"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Refactoring Suggestions</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Code improvement recommendations</p>
-                    </div>
-                    """)
+                    tab_header("Refactoring Suggestions", "Code improvement recommendations")
                     refactor_output.render()
                 
                 # Tab 7: Timeline
                 with gr.TabItem("📈 Timeline"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Error & Warning Timeline</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Temporal analysis of log events</p>
-                    </div>
-                    """)
+                    tab_header("Error & Warning Timeline", "Temporal analysis of log events")
                     timeline_output.render()
                 
                 # Tab 7.5: Postmortem
                 with gr.TabItem("📝 Postmortem"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">Incident Postmortem</h3>
-                        <p style="font-size: 12px; color: var(--md-on-surface-variant);">Structured incident analysis and recommendations</p>
-                    </div>
-                    """)
+                    tab_header("Incident Postmortem", "Structured incident analysis and recommendations")
                     postmortem_output.render()
                 
                 # Tab 8: Logs
-                with gr.TabItem("📋 Logs"):
+                with gr.TabItem(LOGS_TAB_LABEL):
                     logs_display = gr.TextArea(
                         elem_id="log_panel", 
                         interactive=False, 
@@ -1195,11 +854,7 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
                 
                 # Tab 9: Settings
                 with gr.TabItem("⚙️ Settings"):
-                    gr.HTML("""
-                    <div style="margin-bottom: 16px;">
-                        <h3 style="font-size: 14px; font-weight: 600; color: var(--md-on-surface); margin-bottom: 12px;">GitHub Integration</h3>
-                    </div>
-                    """)
+                    tab_header("GitHub Integration")
                     settings_token = gr.Textbox(
                         label="",
                         placeholder="ghp_xxxxxxxxxxxx",
@@ -1213,21 +868,23 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
                         elem_classes="text-xs"
                     )
                     
-                    def save_token(token):
+                    def save_token(token, user_state):
+                        # Kept in this session's state so concurrent users never see each other's token
                         if token:
-                            os.environ["GITHUB_TOKEN"] = token
-                            from project.config import Config
-                            Config.GITHUB_TOKEN = token
-                            return "✅ Token saved (session only)"
-                        return "⚠️ No token provided"
+                            user_state["github_token"] = token
+                            return user_state, "✅ Token saved (session only)"
+                        return user_state, "⚠️ No token provided"
                     
+                    # UI-only handlers are private: they are left out of the API
+                    # schema and cannot be called through the client libraries
                     save_token_btn.click(
                         fn=save_token,
-                        inputs=[settings_token],
-                        outputs=[token_status]
+                        inputs=[settings_token, user_session],
+                        outputs=[user_session, token_status],
+                        api_visibility="private"
                     )
 
-    # 5. Compact Footer
+    # 4. Compact Footer
     with gr.Row(elem_classes="w-full mt-4"):
         gr.HTML("""
         <div class="w-full bg-white border-t border-gray-200 py-3 px-6">
@@ -1246,9 +903,20 @@ with gr.Blocks(title="AutoPilot DevOps") as demo:
         """)
 
     
-    # Auto-Refresh Timer for Logs
-    timer = gr.Timer(value=2)
-    timer.tick(get_live_logs, None, logs_display)
+    # Auto-Refresh Timer for Logs: idle until the Logs tab is opened
+    timer = gr.Timer(value=LOG_POLL_INTERVAL, active=False)
+    # Per-session polling state: last log sequence sent and consecutive idle ticks
+    log_poll = gr.State(value={"seq": None, "idle": 0})
+    timer.tick(poll_live_logs, [log_poll], [logs_display, log_poll, timer], api_visibility="private")
+
+    def on_dashboard_tab_select(evt: gr.SelectData):
+        """Fills the Logs tab when it opens; log polling only runs while it is visible."""
+        if evt.value == LOGS_TAB_LABEL:
+            seq = _LOG_SEQ
+            return get_live_logs(), {"seq": seq, "idle": 0}, gr.Timer(value=LOG_POLL_INTERVAL, active=True)
+        return gr.update(), gr.update(), gr.Timer(active=False)
+
+    dashboard_tabs.select(on_dashboard_tab_select, None, [logs_display, log_poll, timer], queue=False, api_visibility="private")
 
 # --- 5. LAUNCH ---
 if __name__ == "__main__":
@@ -1256,6 +924,6 @@ if __name__ == "__main__":
     
     print("--- AutoPilot DevOps Launching ---")
     if is_spaces:
-        demo.queue().launch(server_name="0.0.0.0", server_port=7860)
+        demo.queue().launch(server_name="0.0.0.0", server_port=7860, css_paths=[_CSS_PATH], head=_HEAD, footer_links=_FOOTER_LINKS)
     else:
-        demo.queue().launch(server_name="127.0.0.1", server_port=7860, share=False)
+        demo.queue().launch(server_name="127.0.0.1", server_port=7860, share=False, css_paths=[_CSS_PATH], head=_HEAD, footer_links=_FOOTER_LINKS)
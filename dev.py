@@ -7,53 +7,137 @@ import os
 import sys
 import time
 import signal
+import threading
 import subprocess
 from pathlib import Path
+from typing import Optional
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
+
+# File types that trigger a restart. Checked before the ignore list, so the
+# .pyc/.log churn of a running app is rejected with a single set lookup.
+WATCHED_SUFFIXES = frozenset({'.py', '.txt', '.md', '.json', '.env'})
+
+
+# The app runs in its own process group so that workers it spawns are stopped
+# with it instead of surviving a reload
+if sys.platform == "win32":
+    _POPEN_GROUP_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _POPEN_GROUP_KWARGS = {"start_new_session": True}
+
+
+# Lock waits cannot be interrupted by Ctrl+C on Windows, so wake periodically there
+_EXIT_WAIT_TIMEOUT = 1.0 if sys.platform == "win32" else None
+
+
+def _signal_group(process: subprocess.Popen, sig: int):
+    """Send sig to every process in the app's process group (Unix)."""
+    try:
+        # start_new_session makes the app a group leader: its pid is the group id
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass  # The whole group has already exited
+
+
+def _terminate(process: Optional[subprocess.Popen], grace: float = 3.0):
+    """Ask the app's process group to exit, and kill it if still running after grace seconds."""
+    if process is None:
+        return
+    if sys.platform == "win32":
+        if process.poll() is not None:
+            return
+        # Delivered to the whole console process group created at launch
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        # Signalled even if the app itself has exited, to reap orphaned workers
+        _signal_group(process, signal.SIGTERM)
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        if sys.platform == "win32":
+            process.kill()
+        else:
+            _signal_group(process, signal.SIGKILL)
+        process.wait()
 
 class AppReloadHandler(FileSystemEventHandler):
     """Handles file system events and restarts the app on changes."""
     
-    def __init__(self, script_path="app.py"):
+    def __init__(self, script_path="app.py", grace=3.0):
         self.script_path = script_path
+        self.grace = grace  # Seconds the app gets to shut down before it is killed
         self.process = None
         self.last_restart = 0
         self.restart_delay = 1.0  # Prevent rapid restarts
-        self.ignored_patterns = [
+        self.trailing_window = 0.5  # Quiet period that ends a burst of saves
+        self._pending_restart = None  # threading.Timer for the trailing restart
+        self._restart_lock = threading.RLock()
+        self.app_exited = threading.Event()  # Set when the app exits on its own
+        # Directory or file names ignored anywhere in a path
+        self.ignored_names = frozenset({
             '__pycache__',
-            '.pyc',
-            '.pyo',
-            '.pyd',
-            '.log',
             '.git',
+            '.autopilot_cache',
             'directory_structure.json',
             'devops_preferences.json',
+            'llm_cache.json',
             'autopilot_devops.log'
-        ]
+        })
+        self.ignored_suffixes = ('.pyc', '.pyo', '.pyd', '.log')
         self.start_app()
     
     def should_ignore(self, file_path):
         """Check if file should be ignored."""
-        path_str = str(file_path).lower()
-        return any(pattern in path_str for pattern in self.ignored_patterns)
+        path_str = str(file_path)
+        return (path_str.endswith(self.ignored_suffixes)
+                or not self.ignored_names.isdisjoint(Path(path_str).parts))
+    
+    def is_watched(self, file_path):
+        """Check if a change to this file should restart the app."""
+        name = os.path.basename(file_path)
+        # Dotfiles such as .env have no suffix; match them by name
+        suffix = os.path.splitext(name)[1] or name
+        return suffix in WATCHED_SUFFIXES and not self.should_ignore(file_path)
+    
+    def request_restart(self):
+        """Restart now, or once a burst of changes settles if the app just restarted.
+        
+        The first change restarts immediately. Changes arriving within
+        restart_delay of a restart are coalesced into a single trailing restart
+        after trailing_window seconds of quiet, so the last save is never lost.
+        """
+        with self._restart_lock:
+            if self._pending_restart is not None:
+                self._pending_restart.cancel()
+                self._pending_restart = None
+            
+            if time.time() - self.last_restart >= self.restart_delay:
+                self.start_app()
+                return
+            
+            timer = threading.Timer(self.trailing_window, lambda: self._trailing_restart(timer))
+            timer.daemon = True
+            self._pending_restart = timer
+            timer.start()
+    
+    def _trailing_restart(self, timer):
+        with self._restart_lock:
+            # Superseded by a newer change while waiting for the lock
+            if self._pending_restart is not timer:
+                return
+            self._pending_restart = None
+            self.start_app()
     
     def start_app(self):
         """Start the application."""
+        with self._restart_lock:
+            self._start_app()
+    
+    def _start_app(self):
         if self.process:
             try:
-                # Kill existing process
-                if sys.platform == "win32":
-                    self.process.terminate()
-                    time.sleep(0.5)
-                    if self.process.poll() is None:
-                        self.process.kill()
-                else:
-                    os.kill(self.process.pid, signal.SIGTERM)
-                    try:
-                        self.process.wait(timeout=3)
-                    except subprocess.TimeoutExpired:
-                        os.kill(self.process.pid, signal.SIGKILL)
+                _terminate(self.process, self.grace)
                 print("\n🛑 Stopped previous instance")
             except Exception as e:
                 print(f"⚠️  Error stopping process: {e}")
@@ -66,42 +150,40 @@ class AppReloadHandler(FileSystemEventHandler):
                 [sys.executable, self.script_path],
                 stdout=sys.stdout,
                 stderr=sys.stderr,
-                cwd=os.getcwd()
+                cwd=os.getcwd(),
+                # Enables dev-only defaults such as the persistent LLM response cache
+                env={**os.environ, "AUTOPILOT_DEV": "1"},
+                **_POPEN_GROUP_KWARGS
             )
             self.last_restart = time.time()
+            threading.Thread(target=self._watch_exit, args=(self.process,), daemon=True).start()
         except Exception as e:
             print(f"❌ Error starting app: {e}")
             sys.exit(1)
     
+    def _watch_exit(self, process):
+        """Block until process exits, then flag it unless it was stopped for a restart."""
+        process.wait()
+        # A restart holds the lock until self.process is the new instance
+        with self._restart_lock:
+            if self.process is process:
+                self.app_exited.set()
+    
     def on_modified(self, event):
         """Handle file modification events."""
-        if event.is_directory:
-            return
-        
-        if self.should_ignore(event.src_path):
+        if event.is_directory or not self.is_watched(event.src_path):
             return
         
-        # Prevent rapid restarts
-        if time.time() - self.last_restart < self.restart_delay:
-            return
-        
-        file_path = Path(event.src_path)
-        if file_path.suffix in ['.py', '.txt', '.md', '.json', '.env']:
-            print(f"\n📝 Detected change: {file_path.name}")
-            self.start_app()
+        print(f"\n📝 Detected change: {Path(event.src_path).name}")
+        self.request_restart()
     
     def on_created(self, event):
         """Handle file creation events."""
-        if event.is_directory:
+        if event.is_directory or not self.is_watched(event.src_path):
             return
         
-        if self.should_ignore(event.src_path):
-            return
-        
-        file_path = Path(event.src_path)
-        if file_path.suffix in ['.py', '.txt', '.md', '.json', '.env']:
-            print(f"\n➕ New file detected: {file_path.name}")
-            self.start_app()
+        print(f"\n➕ New file detected: {Path(event.src_path).name}")
+        self.request_restart()
 
 def main():
     """Main function to start the file watcher."""
@@ -126,32 +208,26 @@ def main():
     
     # Create observer
     observer = Observer()
-    observer.schedule(event_handler, ".", recursive=True)
+    # Only file writes and creations are dispatched; opens, closes, moves and
+    # deletes (e.g. from .git) are dropped before reaching Python handlers
+    observer.schedule(event_handler, ".", recursive=True,
+                      event_filter=[FileModifiedEvent, FileCreatedEvent])
     observer.start()
     
     try:
         while True:
-            time.sleep(1)
-            # Check if process is still running
-            if event_handler.process and event_handler.process.poll() is not None:
-                print("\n⚠️  Process exited unexpectedly. Restarting...")
-                event_handler.start_app()
+            # Sleep until the app exits instead of polling it
+            if not event_handler.app_exited.wait(_EXIT_WAIT_TIMEOUT):
+                continue
+            event_handler.app_exited.clear()
+            print("\n⚠️  Process exited unexpectedly. Restarting...")
+            # Keep a crashing app from restarting more than once per restart_delay
+            time.sleep(max(0.0, event_handler.last_restart + event_handler.restart_delay - time.time()))
+            event_handler.start_app()
     except KeyboardInterrupt:
         print("\n\n🛑 Shutting down...")
         observer.stop()
-        if event_handler.process:
-            try:
-                if sys.platform == "win32":
-                    event_handler.process.terminate()
-                    event_handler.process.wait(timeout=3)
-                else:
-                    os.kill(event_handler.process.pid, signal.SIGTERM)
-                    event_handler.process.wait(timeout=3)
-            except:
-                if sys.platform == "win32":
-                    event_handler.process.kill()
-                else:
-                    os.kill(event_handler.process.pid, signal.SIGKILL)
+        _terminate(event_handler.process, event_handler.grace)
         observer.join()
         print("✅ Stopped")
 
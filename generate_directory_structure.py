@@ -1,43 +1,117 @@
 import os
 import json
+import codecs
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-IGNORE_DIRS = {'.git', '__pycache__', 'venv', 'node_modules', 'cache', 'images','.vscode','drive-mad','generate_directory_structure.py'}
+IGNORE_DIRS = {'.git', '__pycache__', 'venv', 'node_modules', 'cache', 'images','.vscode','drive-mad','.autopilot_cache'}
 
-IGNORE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.exe', '.dll', '.gitignore'}
-ALWAYS_TEXT_FILES = {'.md'}
+IGNORE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.exe', '.dll', '.gitignore'})
+
+# Bytes inspected before deciding whether a file is text
+SNIFF_BYTES = 4096
 
 def read_file(file_path):
-    """Try reading a file with UTF-8 first, then UTF-16 as fallback."""
+    """Read a text file as UTF-8, or as UTF-16 when it starts with a byte order mark.
+
+    Binary files are rejected after reading only their first SNIFF_BYTES.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except UnicodeDecodeError:
-        try:
-            with open(file_path, 'r', encoding='utf-16') as f:
-                return f.read()
-        except Exception:
-            return "<could not read file>"
-
-def read_directory(path):
-    result = {}
+        with open(file_path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+            if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                encoding = 'utf-16'
+            elif b'\x00' in head:
+                return "<could not read file>"
+            else:
+                encoding = 'utf-8'
+            # One read for the rest of the file and one decode, without re-reading the head
+            text = (head + f.read()).decode(encoding)
+    except (UnicodeDecodeError, OSError):
+        return "<could not read file>"
+    # Universal newlines, as text-mode open() gives; most files have no \r
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+OUTPUT_FILE = 'directory_structure.json'
+OUTPUT_PATH = os.path.abspath(OUTPUT_FILE)
+
+# File reads release the GIL, so a pool overlaps their disk latency
+READ_WORKERS = 32
+READ_AHEAD = 64
+
+def _is_included(entry):
+    if entry.is_dir():
+        return entry.name not in IGNORE_DIRS
+    if entry.is_file():
+        # Dotfiles such as .gitignore have no extension; match them by name
+        name = entry.name.lower()
+        if (os.path.splitext(name)[1] or name) in IGNORE_EXTENSIONS:
+            return False
+        # Never read back the output file while it is being written
+        return os.path.abspath(entry.path) != OUTPUT_PATH
+    return False
+
+def _walk(path):
+    """Yield the included entries under path depth-first, in scandir order.
+
+    Yields ("dir", name, path) before a directory's entries and ("end", None, None)
+    after them, and ("file", name, path) for files.
+    """
     for entry in os.scandir(path):
+        if not _is_included(entry):
+            continue
         if entry.is_dir():
-            if entry.name in IGNORE_DIRS:
-                continue
-            result[entry.name] = read_directory(entry.path)
-        elif entry.is_file():
-            if any(entry.name.lower().endswith(ext) for ext in IGNORE_EXTENSIONS):
-                continue
-            _, ext = os.path.splitext(entry.name)
-            if ext.lower() in ALWAYS_TEXT_FILES or True:
-                result[entry.name] = read_file(entry.path)
-    return result
+            yield "dir", entry.name, entry.path
+            yield from _walk(entry.path)
+            yield "end", None, None
+        else:
+            yield "file", entry.name, entry.path
 
-root_dir = '.'  # current directory
+def _close_object(out, is_empty, level):
+    if not is_empty:
+        out.write("\n" + "    " * level)
+    out.write("}")
+
+def write_directory(out, path):
+    """Stream a directory to out as JSON while reading its files in parallel.
 
-directory_structure = read_directory(root_dir)
+    Output matches json.dump(..., ensure_ascii=False, indent=4) of the nested
+    {name: text or subdirectory} mapping. Reads run at most READ_AHEAD entries
+    ahead of the writer, so memory is bounded by that many files, not the tree.
+    """
+    entries = _walk(path)
+    window = deque()
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        def refill():
+            for kind, name, entry_path in islice(entries, READ_AHEAD - len(window)):
+                future = pool.submit(read_file, entry_path) if kind == "file" else None
+                window.append((kind, name, future))
+
+        out.write("{")
+        is_empty = [True]  # One flag per open JSON object
+        refill()
+        while window:
+            kind, name, future = window.popleft()
+            if kind == "end":
+                _close_object(out, is_empty.pop(), len(is_empty))
+            else:
+                separator = "" if is_empty[-1] else ","
+                out.write(separator + "\n" + "    " * len(is_empty) + json.dumps(name, ensure_ascii=False) + ": ")
+                is_empty[-1] = False
+                if kind == "dir":
+                    out.write("{")
+                    is_empty.append(True)
+                else:
+                    out.write(json.dumps(future.result(), ensure_ascii=False))
+            refill()
+        _close_object(out, is_empty.pop(), 0)
+
+root_dir = '.'  # current directory
 
-with open('directory_structure.json', 'w', encoding='utf-8') as f:
-    json.dump(directory_structure, f, ensure_ascii=False, indent=4)
+with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+    write_directory(f, root_dir)
 
-print("Directory structure saved to 'directory_structure.json'")
\ No newline at end of file
+print(f"Directory structure saved to '{OUTPUT_FILE}'")
\ No newline at end of file
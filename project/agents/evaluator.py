@@ -2,46 +2,35 @@
 Evaluator Agent: Safety and quality assurance gatekeeper for DevOps operations.
 """
 import re
+import string
 from typing import Dict
 from project.core.context_engineering import EVALUATOR_PROMPT
 from project.core.a2a_protocol import EvaluatorOutput
 from project.core.observability import logger
 from project.core.gemini_client import GeminiClient
+from project.core.safety_patterns import (
+    BANNED_RE, EXECUTION_RE, REFUSAL_CONTEXT_RE, CAUTION_CONTEXT_RE,
+)
+
+# Removed lines that strip imports, deletion helpers or tables out of a file
+_CRITICAL_DELETION_RE = re.compile("|".join(f"(?:{p})" for p in [
+    r"-\s*import\s+os",
+    r"-\s*import\s+subprocess",
+    r"-\s*def\s+.*delete",
+    r"-\s*def\s+.*remove",
+    r"-\s*DROP\s+TABLE",
+]), re.IGNORECASE)
+
+# Prompt template parsed once. Filled in a single pass, so braces or
+# placeholder names inside the user input or draft are left as they are
+_EVALUATE_PROMPT_TEMPLATE = string.Template(
+    EVALUATOR_PROMPT.replace("{user_input}", "$user_input").replace("{agent_response}", "$agent_response"))
 
 class Evaluator:
     def __init__(self):
         self.client = GeminiClient(EVALUATOR_PROMPT)
         self.mock_mode = False
-        
-        # Enhanced Safety filters for DevOps operations
-        self.banned_phrases = [
-            r"rm\s+-rf",                    # File deletion
-            r"rm\s+.*-r",                   # Recursive deletion
-            r"delete\s+.*file",             # File deletion commands
-            r"DROP\s+TABLE",                # Database drops
-            r"DROP\s+DATABASE",             # Database deletion
-            r"TRUNCATE\s+TABLE",            # Table truncation
-            r"DELETE\s+FROM.*WHERE\s+1=1",  # Mass deletion
-            r"format\s+disk",                # Disk formatting
-            r"shutdown",                    # System shutdown
-            r"sudo\s+",                     # Sudo commands
-            r"systemctl\s+(stop|restart|disable)",  # System service control
-            r"kubectl\s+delete",            # Kubernetes deletion
-            r"chmod\s+777",                 # Unsafe permissions
-            r"chmod\s+.*-R\s+777",          # Recursive unsafe permissions
-            r"uninstall",                   # Uninstallation
-            r"destroy",                     # Destruction commands
-            r"kill\s+-9",                   # Force kill
-            r"pkill\s+-9",                  # Process kill
-            r"exec\s+",                     # Execution commands
-            r"subprocess\.(call|run|Popen)", # Python subprocess execution
-            r"os\.system",                   # OS system calls
-            r"os\.popen",                    # OS popen
-            r"eval\s*\(",                    # Eval execution
-            r"exec\s*\(",                    # Exec execution
-            r"__import__",                  # Dynamic imports (potentially unsafe)
-        ]
-        
+
     def evaluate(self, worker_output: Dict, user_input: str) -> Dict:
         draft = worker_output.get("draft_response", "")
         tools_used = worker_output.get("tools_used", [])
@@ -80,9 +69,10 @@ class Evaluator:
         
         # 2. LLM Contextual Check (Smart Rules)
         # We inject the prompt template manually here to pass both input and response
-        prompt = EVALUATOR_PROMPT.replace("{user_input}", user_input).replace("{agent_response}", draft)
+        prompt = _EVALUATE_PROMPT_TEMPLATE.safe_substitute(user_input=user_input, agent_response=draft)
         
-        evaluation = self.client.generate_json(prompt)
+        # Never replay a cached verdict: the safety policy may have changed since
+        evaluation = self.client.generate_json(prompt, cache=False)
         
         if not evaluation:
             logger.log("Evaluator", "Evaluation failed, defaulting to APPROVED if regex passed")
@@ -109,59 +99,33 @@ class Evaluator:
     
     def _contains_destructive_commands(self, text: str) -> bool:
         """Check for destructive commands in text."""
-        text_lower = text.lower()
-        for pattern in self.banned_phrases:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                # Allow refusal context like "I cannot delete" or "do not execute"
-                if any(phrase in text_lower for phrase in ["cannot", "cannot perform", "do not", "refuse", "not allowed"]):
-                    continue
-                return True
-        return False
+        # Allow refusal context like "I cannot delete" or "do not execute"
+        return bool(BANNED_RE.search(text)) and not REFUSAL_CONTEXT_RE.search(text)
     
     def _contains_execution_commands(self, text: str) -> bool:
         """Check for execution commands (shell, subprocess, etc.)."""
-        execution_patterns = [
-            r"subprocess\.",
-            r"os\.system",
-            r"os\.popen",
-            r"eval\s*\(",
-            r"exec\s*\(",
-            r"bash\s+-c",
-            r"sh\s+-c",
-            r"python\s+-c",
-            r"\.run\s*\(",
-            r"\.call\s*\(",
-        ]
-        text_lower = text.lower()
-        for pattern in execution_patterns:
-            if re.search(pattern, text_lower):
-                # Allow in code examples with warnings
-                if "warning" in text_lower or "do not" in text_lower or "avoid" in text_lower:
-                    continue
-                return True
-        return False
+        # Allow in code examples with warnings
+        return bool(EXECUTION_RE.search(text)) and not CAUTION_CONTEXT_RE.search(text)
     
     def _contains_unsafe_diffs(self, text: str) -> bool:
         """Check for unsafe code diffs (massive deletions, system changes)."""
         # Look for diff patterns with excessive deletions
-        if "---" in text and "+++" in text:  # Git diff format
-            lines = text.split('\n')
-            deletions = sum(1 for line in lines if line.startswith('-') and not line.startswith('---'))
-            additions = sum(1 for line in lines if line.startswith('+') and not line.startswith('+++'))
-            
-            # If deletions significantly exceed additions, might be unsafe
-            if deletions > 50 and deletions > additions * 2:
-                # Check for critical file deletions
-                critical_patterns = [
-                    r"-\s*import\s+os",
-                    r"-\s*import\s+subprocess",
-                    r"-\s*def\s+.*delete",
-                    r"-\s*def\s+.*remove",
-                    r"-\s*DROP\s+TABLE",
-                ]
-                for pattern in critical_patterns:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        return True
+        if "---" not in text or "+++" not in text:  # Not a git diff
+            return False
+        
+        # Count removed and added lines in a single pass
+        deletions = additions = 0
+        for line in text.splitlines():
+            if line[:1] == '-':
+                if line[:3] != '---':
+                    deletions += 1
+            elif line[:1] == '+' and line[:3] != '+++':
+                additions += 1
+        
+        # If deletions significantly exceed additions, might be unsafe:
+        # check for critical file deletions
+        if deletions > 50 and deletions > additions * 2:
+            return bool(_CRITICAL_DELETION_RE.search(text))
         
         return False
     
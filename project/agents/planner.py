@@ -2,12 +2,31 @@
 Planner Agent: Analyzes DevOps requests and creates actionable plans.
 """
 import json
-import re
 from typing import Dict, Optional
 from project.core.context_engineering import PLANNER_PROMPT
 from project.core.a2a_protocol import PlannerOutput
 from project.core.observability import logger
 from project.core.gemini_client import GeminiClient
+from project.core.safety_patterns import PLANNER_DESTRUCTIVE_RE
+
+# Built once; filled in per request with str.format
+_PLAN_PROMPT_TEMPLATE = """
+        Analyze this DevOps request and provide a structured plan.
+        
+        USER PREFERENCES/CONTEXT:
+        {memory}
+        
+        CONVERSATION HISTORY:
+        {history}
+        
+        CURRENT USER REQUEST:
+        {user}
+        
+        Remember: 
+        1. Output ONLY valid JSON.
+        2. Map request to appropriate task_type and action.
+        3. Identify required tools and target paths.
+        """
 
 class Planner:
     def __init__(self):
@@ -16,22 +35,7 @@ class Planner:
         
     def _check_destructive_request(self, text: str) -> bool:
         """Heuristic check for destructive operation requests."""
-        patterns = [
-            r"rm\s+-rf",
-            r"delete\s+.*file",
-            r"drop\s+table",
-            r"format\s+disk",
-            r"shutdown",
-            r"sudo\s+",
-            r"systemctl\s+(stop|restart|disable)",
-            r"kubectl\s+delete",
-            r"chmod\s+777",
-            r"remove\s+.*directory",
-            r"uninstall",
-            r"destroy"
-        ]
-        text_lower = text.lower()
-        return any(re.search(p, text_lower) for p in patterns)
+        return PLANNER_DESTRUCTIVE_RE.search(text) is not None
 
     def plan(self, user_input: str, history_str: str, memory_str: str = "") -> Dict:
         logger.log("Planner", "Analyzing DevOps request...", 
@@ -56,23 +60,7 @@ class Planner:
             return self._mock_plan(user_input)
         
         # Prepare prompt with context
-        prompt = f"""
-        Analyze this DevOps request and provide a structured plan.
-        
-        USER PREFERENCES/CONTEXT:
-        {memory_str}
-        
-        CONVERSATION HISTORY:
-        {history_str}
-        
-        CURRENT USER REQUEST:
-        {user_input}
-        
-        Remember: 
-        1. Output ONLY valid JSON.
-        2. Map request to appropriate task_type and action.
-        3. Identify required tools and target paths.
-        """
+        prompt = _PLAN_PROMPT_TEMPLATE.format(memory=memory_str, history=history_str, user=user_input)
         
         response_data = self.client.generate_json(prompt)
         
@@ -2,9 +2,15 @@
 Worker Agent: Executes DevOps plans and generates analysis responses.
 """
 import os
-import io
+import re
+import heapq
+import hashlib
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
 from typing import Dict, Optional
-from project.core.context_engineering import WORKER_PROMPT
+from project.core.context_engineering import WORKER_PROMPT, WORKER_REPORT_INSTRUCTIONS
 from project.core.a2a_protocol import WorkerOutput
 from project.tools.tools import Tools
 from project.tools.github_tools import GitHubTools
@@ -12,15 +18,198 @@ from project.tools.visualizations import Visualizations
 from project.config import Config
 from project.core.observability import logger
 from project.core.gemini_client import GeminiClient
-from PIL import Image as PILImage
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+
+# Most Python files analyzed for complexity in one request
+MAX_COMPLEXITY_FILES = 50
+COMPLEXITY_IGNORE_DIRS = {'.git', '__pycache__', 'venv', 'node_modules', '.gradio', 'tests', 'dist', 'build'}
+# Instruction keywords asking for repository-wide complexity ("complex" covers "complexity")
+_COMPLEXITY_REQUEST_RE = re.compile(r"heatmap|complex|hotspot|metric")
+# Repository analyses kept for reuse while the working tree is unchanged
+REPO_CACHE_SIZE = 4
+# Files the app itself writes while serving requests; changes to them do not
+# invalidate a cached repository analysis
+_RUNTIME_ARTIFACTS = frozenset({
+    b'autopilot_devops.log',
+    b'devops_preferences.json',
+    b'directory_structure.json',
+    b'llm_cache.json',
+})
+_RUNTIME_ARTIFACT_SUFFIXES = (b'.log',)
+
+
+def _avg_complexity(item: Dict) -> float:
+    """Sort key: a complexity_data entry's average cyclomatic complexity."""
+    return item.get("complexity", {}).get("avg_complexity", 0)
+
+# Files are analyzed on a shared thread pool so their reads overlap. A process
+# pool is not used: forking this multithreaded app can deadlock a child on a
+# lock held by another thread, and spawn would re-run app.py and rebuild the
+# whole UI in every worker.
+_analysis_pool = ThreadPoolExecutor(thread_name_prefix="worker-analysis")
+
+
+def _run_tools(calls: list) -> list:
+    """Run (tool, path) calls on the analysis pool.
+
+    Returns (result, error) pairs in call order; a failing call does not stop
+    the others.
+    """
+    futures = [_analysis_pool.submit(tool, path) for tool, path in calls]
+    outcomes = []
+    for future in futures:
+        try:
+            outcomes.append((future.result(), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+# Charts are drawn on one background thread while the LLM writes the draft.
+# A single thread keeps the Worker's pyplot calls from interleaving.
+_viz_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="worker-viz")
+
+
+def _render_or_placeholder(render, data, what: str):
+    """Render a chart, or an error placeholder image if rendering fails."""
+    try:
+        image = render(data)
+        logger.log("Worker", f"Generated {what} visualization", level="INFO")
+        return image
+    except Exception as e:
+        logger.log("Worker", f"Failed to generate {what}: {e}", level="ERROR")
+        import traceback
+        logger.log("Worker", f"Traceback: {traceback.format_exc()}", level="ERROR")
+        try:
+            return Visualizations.error_placeholder(f"Error generating {what}:\n{str(e)}")
+        except Exception as e2:
+            logger.log("Worker", f"Failed to create error placeholder: {e2}", level="ERROR")
+            return None
+
+
+def _resolve_renders(results: Dict):
+    """Replace chart futures in results (and its nested dicts) with their images."""
+    for container in [results] + [v for v in results.values() if isinstance(v, dict)]:
+        for key, value in list(container.items()):
+            if isinstance(value, Future):
+                image = value.result()
+                if image is None:
+                    del container[key]
+                else:
+                    container[key] = image
+
+
+def _submit_repo_charts(dep_graph: Dict, complexity_data: list) -> Dict:
+    """Start drawing a repository analysis's charts; returns their futures by name."""
+    return {
+        "dependency_graph_image": _viz_pool.submit(
+            _render_or_placeholder, Visualizations.plot_dependency_graph, dep_graph, "dependency graph"),
+        "complexity_heatmap": _viz_pool.submit(
+            _render_or_placeholder, Visualizations.plot_complexity_heatmap, complexity_data, "complexity heatmap"),
+    }
+
+
+def _iter_py_files(repo_path: str, limit: int = MAX_COMPLEXITY_FILES):
+    """Yield (relative path, full path) for up to limit Python files under repo_path.
+    
+    Visits entries in os.walk's top-down order, skipping COMPLEXITY_IGNORE_DIRS
+    before descending. Directories are read with a single scandir each, and
+    relative paths are built from the directory stack instead of relpath().
+    """
+    count = 0
+    # (full path, relative prefix) of directories still to visit, deepest last
+    stack = [(repo_path, "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue  # Unreadable directory, as os.walk skips it
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Like os.walk, do not descend into symlinked directories
+                if entry.name not in COMPLEXITY_IGNORE_DIRS and not entry.is_symlink():
+                    subdirs.append((entry.path, prefix + entry.name + os.sep))
+            elif entry.name.endswith('.py'):
+                yield prefix + entry.name, entry.path
+                count += 1
+                if count >= limit:
+                    return
+        # Reversed so the first subdirectory is visited next
+        stack.extend(reversed(subdirs))
+
+
+def _git(repo_path: str, *args: str) -> bytes:
+    """Run a read-only git command in repo_path and return its output."""
+    return subprocess.run(["git", "-C", repo_path, *args], capture_output=True,
+                          timeout=10, check=True).stdout
+
+
+def _is_runtime_artifact(path: bytes) -> bool:
+    """Whether path (relative to the work tree) is a file the app writes itself."""
+    return (path.endswith(_RUNTIME_ARTIFACT_SUFFIXES)
+            or path.rsplit(b"/", 1)[-1] in _RUNTIME_ARTIFACTS)
+
+
+def _repo_fingerprint(repo_path: str) -> Optional[str]:
+    """Hash of the checked-out commit and all uncommitted changes in repo_path.
+    
+    Ignored files and the app's own runtime artifacts (logs, saved
+    preferences, caches) are left out, so serving a request does not change it.
+    Returns None when repo_path is not inside a git work tree (or git is
+    unavailable), in which case the repository is always analyzed afresh.
+    """
+    try:
+        toplevel = _git(repo_path, "rev-parse", "--show-toplevel").rstrip(b"\n")
+        # --branch adds the checked-out commit as a "# branch.oid" header
+        status = _git(repo_path, "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all")
+    except (OSError, subprocess.SubprocessError):
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    # status only names the dirty files; their size and mtime catch further
+    # edits to a file that was already modified
+    entries = iter(status.split(b"\0"))
+    for entry in entries:
+        kind = entry[:2]
+        if kind == b"1 ":
+            path = entry.split(b" ", 8)[-1]
+        elif kind == b"2 ":
+            path = entry.split(b" ", 9)[-1]
+            entry += b"\0" + next(entries, b"")  # Renames and copies are followed by the source path
+        elif kind == b"u ":
+            path = entry.split(b" ", 10)[-1]
+        elif kind == b"? ":
+            path = entry[2:]
+        else:
+            digest.update(entry + b"\0")  # Headers (the checked-out commit) and the trailing empty entry
+            continue
+        if _is_runtime_artifact(path):
+            continue
+        digest.update(entry + b"\0")
+        try:
+            st = os.stat(os.path.join(toplevel, path))
+        except OSError:
+            continue  # Deleted: already recorded by the status line
+        digest.update(b"%d:%d" % (st.st_mtime_ns, st.st_size))
+    return digest.hexdigest()
+
 
 class Worker:
     def __init__(self):
-        self.client = GeminiClient(WORKER_PROMPT)
+        # Static text first: the request-specific part goes last in the user turn
+        self.client = GeminiClient(WORKER_PROMPT + WORKER_REPORT_INSTRUCTIONS)
         self.mock_mode = False
+        # (repo, scope) -> (fingerprint, repo analysis), most recently used last
+        self._repo_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+    def reset(self) -> None:
+        """Drop the last analysis results, including their chart images."""
+        self._last_analysis_results = None
         
     def work(self, planner_output: Dict) -> Dict:
         instruction = planner_output.get("instruction", "")
@@ -73,79 +262,47 @@ class Worker:
             context_data = f"Error during analysis: {str(e)}"
             tools_used = []
         
-        # Build prompt for LLM
+        # Handlers record a tool once per file; report each tool once, in first-use order
+        tools_used = list(dict.fromkeys(tools_used))
+        
+        # Build prompt for LLM (instructions are in the system prompt)
         prompt = f"""
         USER REQUEST: {instruction}
         
         ANALYSIS CONTEXT (ALL ANALYSIS HAS BEEN COMPLETED):
         {context_data}
-        
-        IMPORTANT INSTRUCTIONS:
-        - The analysis has ALREADY BEEN PERFORMED by automated tools
-        - Report on the ACTUAL results provided in the context above
-        - Do NOT say you cannot execute code or use tools - the work is already done!
-        - If complexity heatmap was generated, mention it in your response
-        - If dependency graph was generated, mention it in your response
-        - Provide insights based on the ACTUAL data, not hypothetical examples
-        
-        Generate a comprehensive DevOps response reporting on the completed analysis results.
         """
         
-        # Generate response
-        draft = self.client.generate_response(prompt)
+        # Generate response. The context holds the analysis results, so an
+        # unchanged repository and request reuse the previous draft
+        if action == "enforce_boundary" or context_data.startswith("Error during analysis"):
+            draft = self.client.generate_response(prompt)
+        else:
+            draft = self.client.generate_cached_response(prompt, Config.WORKER_CACHE_TTL)
         
         if not draft:
             # Fallback response
             draft = "I apologize, but I'm having trouble generating a response. Please try again with a more specific request."
         
-        # Append analysis results if available
-        if analysis_results:
-            draft += "\n\n## Analysis Results\n\n"
-            draft += self._format_analysis_results(analysis_results)
-        
-        # Store analysis results for main agent to access
-        # Ensure visualizations are properly structured
-        if "visualizations" not in analysis_results:
-            analysis_results["visualizations"] = {}
-        
-        # Extract visualization images from analysis_results and add to visualizations dict
-        # These are stored directly in analysis_results (which is the 'results' dict from _handle_* methods)
-        for key in ["dependency_graph_image", "complexity_heatmap"]:
-            if key in analysis_results:
-                analysis_results["visualizations"][key] = analysis_results.pop(key)
-        
-        # Extract timeline visualizations (check multiple possible locations)
-        # Timeline might be in results["visualizations"]["error_timeline"] or results["{log_file}_timeline"]
-        if "visualizations" in analysis_results:
-            if "error_timeline" in analysis_results["visualizations"]:
-                # Already in visualizations, keep it
-                logger.log("Worker", f"Timeline already in visualizations dict: {type(analysis_results['visualizations']['error_timeline'])}", level="INFO")
-            else:
-                # Check for timeline keys in results (top level) - these are like "autopilot_devops.log_timeline"
-                for key, value in list(analysis_results.items()):
-                    if "_timeline" in key and hasattr(value, 'save'):  # PIL Image
-                        analysis_results["visualizations"]["error_timeline"] = value
-                        del analysis_results[key]
-                        logger.log("Worker", f"Moved timeline from {key} to visualizations", level="INFO")
-                        break
-                # Also check nested structures (log file results) - these are like results["autopilot_devops.log"]["timeline"]
-                if "error_timeline" not in analysis_results["visualizations"]:
-                    for key, value in list(analysis_results.items()):
-                        if isinstance(value, dict):
-                            for sub_key, sub_value in value.items():
-                                if "_timeline" in sub_key and hasattr(sub_value, 'save'):
-                                    analysis_results["visualizations"]["error_timeline"] = sub_value
-                                    logger.log("Worker", f"Found timeline in nested structure: {key}.{sub_key}", level="INFO")
-                                    break
-        else:
-            # No visualizations dict yet, check if timeline exists anywhere
-            for key, value in list(analysis_results.items()):
-                if "_timeline" in key and hasattr(value, 'save'):
-                    if "visualizations" not in analysis_results:
-                        analysis_results["visualizations"] = {}
-                    analysis_results["visualizations"]["error_timeline"] = value
-                    logger.log("Worker", f"Created visualizations dict and moved timeline from {key}", level="INFO")
-                    break
+        # Chat, refusals and failed analyses have no results or charts to attach
+        if not analysis_results:
+            self._last_analysis_results = {"visualizations": {}}
+            return WorkerOutput(
+                draft_response=draft,
+                tools_used=tools_used,
+                technique_applied=None  # Keep for compatibility
+            ).to_dict()
+        
+        # Charts were submitted by the handlers and rendered during the LLM call
+        _resolve_renders(analysis_results)
+        
+        # Append analysis results
+        draft += "\n\n## Analysis Results\n\n"
+        draft += self._format_analysis_results(analysis_results)
+        
+        # Store analysis results for main agent to access. Handlers put their
+        # charts straight into analysis_results["visualizations"]
+        analysis_results.setdefault("visualizations", {})
         
         self._last_analysis_results = analysis_results
         
@@ -155,11 +312,57 @@ class Worker:
             technique_applied=None  # Keep for compatibility
         ).to_dict()
     
+    def _compute_repo_complexity(self, repo_path: str) -> tuple:
+        """Compute complexity for the repository's Python files (up to MAX_COMPLEXITY_FILES).
+        
+        Returns:
+            ([{"file": relative path, "complexity": dict}, ...], failed file count)
+        """
+        files = list(_iter_py_files(repo_path))
+        if len(files) >= MAX_COMPLEXITY_FILES:
+            logger.log("Worker", f"Reached limit of {MAX_COMPLEXITY_FILES} files for complexity analysis", level="INFO")
+        
+        complexity_data = []
+        files_failed = 0
+        outcomes = _run_tools([(Tools.compute_complexity, full_path) for _, full_path in files])
+        for (rel_path, _), (complexity, error) in zip(files, outcomes):
+            if error is not None:
+                files_failed += 1
+                logger.log("Worker", f"Failed to compute complexity for {rel_path}: {error}", level="WARNING")
+                continue
+            complexity_data.append({"file": rel_path, "complexity": complexity})
+        return complexity_data, files_failed
+    
     def _handle_repo_analysis(self, target_paths: list, repo_path: str = ".", instruction: str = "") -> tuple:
-        """Handle repository analysis."""
+        """Handle repository analysis.
+        
+        The analysis is reused while the repository's git commit and
+        uncommitted changes stay the same.
+        """
         tools_used = []
         results = {}
         
+        # Check if user requested complexity heatmap or full complexity analysis
+        instruction_lower = instruction.lower() if instruction else ""
+        needs_full_complexity = (
+            _COMPLEXITY_REQUEST_RE.search(instruction_lower) is not None or
+            not target_paths  # If no specific paths, do full analysis
+        )
+        
+        fingerprint = _repo_fingerprint(repo_path)
+        cache_key = (os.path.abspath(repo_path), needs_full_complexity,
+                     () if needs_full_complexity else tuple(target_paths[:20]))
+        cached = self._repo_cache.get(cache_key)
+        if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+            self._repo_cache.move_to_end(cache_key)
+            logger.log("Worker", f"Repository unchanged since last analysis, reusing results for {repo_path}", level="INFO")
+            context, cached_tools, cached_results = cached[1]
+            # Only the data is cached; the charts are drawn again for this request
+            results = dict(cached_results)
+            results["visualizations"] = _submit_repo_charts(
+                results["dependency_graph"], results.get("complexity", []))
+            return context, list(cached_tools), results
+        
         # Read directory tree
         tree_data = Tools.read_directory_tree(repo_path)
         tools_used.append("read_directory_tree")
@@ -170,17 +373,6 @@ class Worker:
         tools_used.append("get_dependency_graph")
         results["dependency_graph"] = dep_graph
         
-        # Check if user requested complexity heatmap or full complexity analysis
-        instruction_lower = instruction.lower() if instruction else ""
-        needs_full_complexity = (
-            "heatmap" in instruction_lower or 
-            "complexity" in instruction_lower or
-            "complex" in instruction_lower or
-            "hotspot" in instruction_lower or
-            "metric" in instruction_lower or
-            not target_paths  # If no specific paths, do full analysis
-        )
-        
         logger.log("Worker", f"Complexity analysis decision: needs_full={needs_full_complexity}, target_paths={target_paths[:3] if target_paths else 'None'}, instruction='{instruction[:100]}'", level="INFO")
         
         # Analyze complexity - ALWAYS analyze all Python files for heatmap/complexity requests
@@ -194,7 +386,6 @@ class Worker:
                 if full_path.endswith('.py') and os.path.exists(full_path):
                     try:
                         complexity = Tools.compute_complexity(full_path)
-                        tools_used.append("compute_complexity")
                         complexity_data.append({"file": path, "complexity": complexity})
                         logger.log("Worker", f"Computed complexity for {path}: avg={complexity.get('avg_complexity', 0)}", level="DEBUG")
                     except Exception as e:
@@ -202,33 +393,11 @@ class Worker:
         else:
             # Analyze ALL Python files in repository for full heatmap
             logger.log("Worker", f"Full complexity analysis requested (heatmap/complete). Analyzing all Python files in {repo_path}", level="INFO")
-            files_analyzed = 0
-            files_failed = 0
-            for root, dirs, files in os.walk(repo_path):
-                # Skip ignored directories
-                dirs[:] = [d for d in dirs if d not in {'.git', '__pycache__', 'venv', 'node_modules', '.gradio', 'tests', 'dist', 'build'}]
-                for file in files:
-                    if file.endswith('.py'):
-                        full_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(full_path, repo_path)
-                        try:
-                            complexity = Tools.compute_complexity(full_path)
-                            tools_used.append("compute_complexity")
-                            complexity_data.append({"file": rel_path, "complexity": complexity})
-                            files_analyzed += 1
-                            if files_analyzed % 10 == 0:
-                                logger.log("Worker", f"Analyzed {files_analyzed} files so far...", level="INFO")
-                            # Limit to top 50 files to avoid performance issues
-                            if len(complexity_data) >= 50:
-                                logger.log("Worker", f"Reached limit of 50 files for complexity analysis", level="INFO")
-                                break
-                        except Exception as e:
-                            files_failed += 1
-                            logger.log("Worker", f"Failed to compute complexity for {rel_path}: {e}", level="WARNING")
-                if len(complexity_data) >= 50:
-                    break
+            complexity_data, files_failed = self._compute_repo_complexity(repo_path)
             
-            logger.log("Worker", f"Complexity analysis complete: {files_analyzed} files analyzed, {files_failed} failed, {len(complexity_data)} total results", level="INFO")
+            logger.log("Worker", f"Complexity analysis complete: {len(complexity_data)} files analyzed, {files_failed} failed", level="INFO")
+        if complexity_data:
+            tools_used.append("compute_complexity")
         
         # Detect dead code
         dead_code = Tools.detect_dead_code(repo_path)
@@ -240,74 +409,27 @@ class Worker:
         tools_used.append("detect_duplicate_code")
         results["duplicates"] = duplicates
         
-        # Generate dependency graph visualization (always generate, even if empty)
-        try:
-            dep_graph_viz = Visualizations.plot_dependency_graph(dep_graph)
-            results["dependency_graph_image"] = dep_graph_viz
-            node_count = dep_graph.get("node_count", 0)
-            edge_count = dep_graph.get("edge_count", 0)
-            logger.log("Worker", f"Generated dependency graph visualization: {node_count} nodes, {edge_count} edges", level="INFO")
-        except Exception as e:
-            logger.log("Worker", f"Failed to generate dependency graph viz: {e}", level="ERROR")
-            import traceback
-            logger.log("Worker", f"Traceback: {traceback.format_exc()}", level="ERROR")
-            # Create a placeholder image on error
-            try:
-                fig, ax = plt.subplots(figsize=(8, 6), facecolor='#1a1a1a')
-                ax.set_facecolor('#1a1a1a')
-                ax.text(0.5, 0.5, f'Error generating dependency graph:\n{str(e)}', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, color='#ff6b6b', fontsize=12)
-                ax.axis('off')
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', facecolor='#1a1a1a', edgecolor='none')
-                buf.seek(0)
-                plt.close()
-                results["dependency_graph_image"] = PILImage.open(buf)
-            except:
-                pass
+        # Generate dependency graph visualization (always generate, even if empty).
+        # Charts render in the background; work() collects them after the LLM call
+        logger.log("Worker", f"Generating dependency graph visualization: {dep_graph.get('node_count', 0)} nodes, {dep_graph.get('edge_count', 0)} edges", level="INFO")
         
         # Generate complexity heatmap (always generate, even if empty)
-        try:
-            logger.log("Worker", f"Generating complexity heatmap with {len(complexity_data)} files", level="INFO")
-            if complexity_data:
-                # Log sample complexity data for debugging
-                sample = complexity_data[0] if complexity_data else {}
-                logger.log("Worker", f"Sample complexity data: file={sample.get('file', 'N/A')}, complexity keys={list(sample.get('complexity', {}).keys())}", level="DEBUG")
-            
-            heatmap = Visualizations.plot_complexity_heatmap(complexity_data)
-            results["complexity_heatmap"] = heatmap
-            logger.log("Worker", f"Successfully generated complexity heatmap visualization: {len(complexity_data)} files analyzed", level="INFO")
-        except Exception as e:
-            logger.log("Worker", f"Failed to generate heatmap: {e}", level="ERROR")
-            import traceback
-            logger.log("Worker", f"Traceback: {traceback.format_exc()}", level="ERROR")
-            # Create a placeholder image on error
-            try:
-                fig, ax = plt.subplots(figsize=(8, 6), facecolor='#1a1a1a')
-                ax.set_facecolor('#1a1a1a')
-                ax.text(0.5, 0.5, f'Error generating complexity heatmap:\n{str(e)}', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, color='#ff6b6b', fontsize=12)
-                ax.axis('off')
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', facecolor='#1a1a1a', edgecolor='none')
-                buf.seek(0)
-                plt.close()
-                results["complexity_heatmap"] = PILImage.open(buf)
-            except Exception as e2:
-                logger.log("Worker", f"Failed to create error placeholder: {e2}", level="ERROR")
+        logger.log("Worker", f"Generating complexity heatmap with {len(complexity_data)} files", level="INFO")
+        if complexity_data:
+            # Log sample complexity data for debugging
+            sample = complexity_data[0]
+            logger.log("Worker", f"Sample complexity data: file={sample.get('file', 'N/A')}, complexity keys={list(sample.get('complexity', {}).keys())}", level="DEBUG")
+        visualizations = results["visualizations"] = _submit_repo_charts(dep_graph, complexity_data)
         
         # Format complexity summary for context
         complexity_summary = self._format_complexity(complexity_data)
-        heatmap_generated = "complexity_heatmap" in results
-        dep_graph_generated = "dependency_graph_image" in results
+        heatmap_generated = "complexity_heatmap" in visualizations
+        dep_graph_generated = "dependency_graph_image" in visualizations
         
         # Create detailed complexity report
+        # Top 10 for the report; the refactor suggestions below reuse the first 5
+        top_complex = heapq.nlargest(10, complexity_data, key=_avg_complexity)
         if complexity_data:
-            top_complex = sorted(complexity_data, 
-                               key=lambda x: x.get("complexity", {}).get("avg_complexity", 0), 
-                               reverse=True)[:10]
             complexity_details = "\n".join([
                 f"  {i+1}. {item.get('file', 'unknown')}: avg={item.get('complexity', {}).get('avg_complexity', 0):.1f}, total={item.get('complexity', {}).get('complexity', 0)}, functions={item.get('complexity', {}).get('function_count', 0)}"
                 for i, item in enumerate(top_complex)
@@ -357,11 +479,8 @@ class Worker:
         # Generate refactoring suggestions for top complex files
         if complexity_data:
             refactor_suggestions = []
-            top_complex = sorted(complexity_data, 
-                               key=lambda x: x.get("complexity", {}).get("avg_complexity", 0), 
-                               reverse=True)[:5]  # Top 5 most complex files
-            
-            for item in top_complex:
+            candidates = []
+            for item in top_complex[:5]:  # Top 5 most complex files
                 file_path = item.get("file", "")
                 if not file_path or not file_path.endswith('.py'):
                     continue
@@ -369,9 +488,15 @@ class Worker:
                 full_path = os.path.join(repo_path, file_path) if not os.path.isabs(file_path) else file_path
                 if not os.path.exists(full_path):
                     continue
-                
+                candidates.append((item, full_path))
+            
+            # Extract imports for every candidate at once on the analysis pool
+            outcomes = _run_tools([(Tools.extract_imports, full_path) for _, full_path in candidates])
+            for (item, _), (imports, error) in zip(candidates, outcomes):
+                if error is not None:
+                    raise error
+                file_path = item["file"]
                 complexity = item.get("complexity", {})
-                imports = Tools.extract_imports(full_path)
                 tools_used.append("extract_imports")
                 
                 refactor_suggestions.append({
@@ -384,6 +509,14 @@ class Worker:
             if refactor_suggestions:
                 results["refactor_suggestions"] = refactor_suggestions
         
+        if fingerprint is not None:
+            # Without the chart images, so reset() can release them
+            data = {key: value for key, value in results.items() if key != "visualizations"}
+            self._repo_cache[cache_key] = (fingerprint, (context, list(tools_used), data))
+            self._repo_cache.move_to_end(cache_key)
+            if len(self._repo_cache) > REPO_CACHE_SIZE:
+                self._repo_cache.popitem(last=False)
+        
         return context, tools_used, results
     
     def _handle_incident_analysis(self, target_paths: list, repo_path: str = ".") -> tuple:
@@ -397,57 +530,35 @@ class Worker:
         all_errors = []
         all_warnings = []
         
-        for log_file in log_files[:3]:  # Limit to 3 log files
-            if not log_file:
-                continue
-            
-            # Handle relative paths within repo
-            full_path = os.path.join(repo_path, log_file) if not os.path.isabs(log_file) else log_file
-            log_data = Tools.parse_logs(full_path)
+        # Handle relative paths within repo
+        log_paths = [(log_file, os.path.join(repo_path, log_file) if not os.path.isabs(log_file) else log_file)
+                     for log_file in log_files[:3] if log_file]  # Limit to 3 log files
+        
+        # Read and parse every log file at once on the analysis pool
+        parsed = []
+        for (log_file, _), (log_data, error) in zip(log_paths, _run_tools([(Tools.parse_logs, path) for _, path in log_paths])):
+            if error is not None:
+                raise error
             tools_used.append("parse_logs")
-            
-            # ALWAYS generate timeline visualization, even if no errors
-            try:
-                timeline_viz = Visualizations.plot_error_timeline(log_data)
-                # Store in both places for compatibility
-                results[f"{log_file}_timeline"] = timeline_viz
-                # Also store in visualizations dict for main agent extraction
-                if "visualizations" not in results:
-                    results["visualizations"] = {}
-                results["visualizations"]["error_timeline"] = timeline_viz
-                error_count = log_data.get('error_count', 0)
-                warning_count = len(log_data.get('warnings', []))
-                logger.log("Worker", f"Generated error timeline visualization for {log_file} (errors: {error_count}, warnings: {warning_count})", level="INFO")
-            except Exception as e:
-                logger.log("Worker", f"Failed to generate timeline: {e}", level="ERROR")
-                import traceback
-                logger.log("Worker", f"Traceback: {traceback.format_exc()}", level="ERROR")
-                # Create placeholder on error
-                try:
-                    fig, ax = plt.subplots(figsize=(10, 6), facecolor='#1a1a1a')
-                    ax.set_facecolor('#1a1a1a')
-                    ax.text(0.5, 0.5, f'Error generating timeline:\n{str(e)}', 
-                           horizontalalignment='center', verticalalignment='center',
-                           transform=ax.transAxes, color='#ff6b6b', fontsize=12)
-                    ax.axis('off')
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format='png', facecolor='#1a1a1a', edgecolor='none')
-                    buf.seek(0)
-                    plt.close()
-                    if "visualizations" not in results:
-                        results["visualizations"] = {}
-                    results["visualizations"]["error_timeline"] = PILImage.open(buf)
-                except:
-                    pass
-            
-            if log_data.get("error_count", 0) > 0:
-                # Cluster errors
-                clusters = Tools.cluster_errors(log_data)
-                tools_used.append("cluster_errors")
-                
-                # Detect anomalies
-                anomalies = Tools.detect_anomalies(log_data)
-                tools_used.append("detect_anomalies")
+            parsed.append((log_file, log_data))
+        
+        # Cluster errors and detect anomalies for all failing logs in one batch
+        failing = [(log_file, log_data) for log_file, log_data in parsed if log_data.get("error_count", 0) > 0]
+        calls = []
+        for _, log_data in failing:
+            calls += [(Tools.cluster_errors, log_data), (Tools.detect_anomalies, log_data)]
+        outcomes = iter(_run_tools(calls))
+        analyses = {}
+        for log_file, _ in failing:
+            (clusters, cluster_error), (anomalies, anomaly_error) = next(outcomes), next(outcomes)
+            if cluster_error is not None or anomaly_error is not None:
+                raise cluster_error or anomaly_error
+            analyses[log_file] = (clusters, anomalies)
+        
+        for log_file, log_data in parsed:
+            if log_file in analyses:
+                clusters, anomalies = analyses[log_file]
+                tools_used += ["cluster_errors", "detect_anomalies"]
                 
                 # Generate postmortem
                 postmortem = Tools.generate_postmortem(clusters, 
@@ -472,6 +583,16 @@ class Worker:
             all_errors.extend(log_data.get("errors", []))
             all_warnings.extend(log_data.get("warnings", []))
         
+        # ALWAYS generate timeline visualization, even if no errors. Only the
+        # last log's timeline is shown, so only that one is rendered
+        if parsed:
+            log_file, log_data = parsed[-1]
+            results.setdefault("visualizations", {})["error_timeline"] = _viz_pool.submit(
+                _render_or_placeholder, Visualizations.plot_error_timeline, log_data, "error timeline")
+            error_count = log_data.get('error_count', 0)
+            warning_count = len(log_data.get('warnings', []))
+            logger.log("Worker", f"Generating error timeline visualization for {log_file} (errors: {error_count}, warnings: {warning_count})", level="INFO")
+        
         # Helper to safely get clusters count
         def get_clusters_count(log_file_key):
             if not log_file_key or log_file_key not in results:
@@ -532,6 +653,10 @@ class Worker:
         tools_used.append("generate_migration_plan")
         results["migration_plan"] = migration_plan
         
+        # Joined outside the f-string, which cannot contain a backslash before Python 3.12
+        steps = "\n".join(migration_plan.get('steps', []))
+        breaking_changes = "\n".join(migration_plan.get('breaking_changes', []))
+        
         context = f"""
         Migration Analysis:
         - Source Framework: {source_framework}
@@ -539,10 +664,10 @@ class Worker:
         - Deprecated packages found: {len(outdated.get('deprecated', []))}
         
         Migration Steps:
-        {chr(10).join(migration_plan.get('steps', []))}
+        {steps}
         
         Breaking Changes:
-        {chr(10).join(migration_plan.get('breaking_changes', []))}
+        {breaking_changes}
         """
         
         return context, tools_used, results
@@ -557,7 +682,7 @@ class Worker:
         # If no target_paths provided, analyze top complex files from full analysis
         if not target_paths:
             # Perform full complexity analysis to find complex files
-            complexity_data = Tools.compute_complexity(repo_path)
+            complexity_data, _ = self._compute_repo_complexity(repo_path)
             tools_used.append("compute_complexity")
             
             # Sort by complexity and take top 5
@@ -569,27 +694,29 @@ class Worker:
             
             target_paths = [item.get("file", "") for item in sorted_files if item.get("file")]
         
+        files = []
         for path in target_paths[:5]:  # Limit to 5 files
             if not path or not path.endswith('.py'):
                 continue
             
             # Handle relative paths within repo
             full_path = os.path.join(repo_path, path) if not os.path.isabs(path) else path
-            if not os.path.exists(full_path):
+            if os.path.exists(full_path):
+                files.append((path, full_path))
+        
+        # Read, compute complexity and extract imports for every file at once
+        calls = []
+        for _, full_path in files:
+            calls += [(Tools.read_file, full_path), (Tools.compute_complexity, full_path), (Tools.extract_imports, full_path)]
+        outcomes = _run_tools(calls)
+        
+        for i, (path, _) in enumerate(files):
+            _, (complexity_result, complexity_error), (imports, imports_error) = outcomes[3 * i:3 * i + 3]
+            tools_used += ["read_file", "compute_complexity", "extract_imports"]
+            if complexity_error is not None or imports_error is not None:
+                logger.log("Worker", f"Failed to analyze {path}: {complexity_error or imports_error}", level="WARNING")
                 continue
             
-            # Read file
-            file_data = Tools.read_file(full_path)
-            tools_used.append("read_file")
-            
-            # Compute complexity
-            complexity_result = Tools.compute_complexity(full_path)
-            tools_used.append("compute_complexity")
-            
-            # Extract imports
-            imports = Tools.extract_imports(full_path)
-            tools_used.append("extract_imports")
-            
             # Handle both dict and list results from compute_complexity
             if isinstance(complexity_result, list) and len(complexity_result) > 0:
                 complexity = complexity_result[0].get("complexity", {})
@@ -679,14 +806,12 @@ class Worker:
         
         formatted = []
         # Sort by average complexity (descending) to show most complex first
-        sorted_data = sorted(complexity_data, 
-                           key=lambda x: x.get("complexity", {}).get("avg_complexity", 0), 
-                           reverse=True)
+        sorted_data = heapq.nlargest(10, complexity_data, key=_avg_complexity)
         
         formatted.append(f"Total files analyzed: {len(complexity_data)}")
         formatted.append(f"\nTop {min(10, len(sorted_data))} most complex files:")
         
-        for item in sorted_data[:10]:  # Show top 10
+        for item in sorted_data:  # Show top 10
             file = item.get("file", "unknown")
             comp = item.get("complexity", {})
             avg = comp.get("avg_complexity", 0)
@@ -2,14 +2,23 @@
 # file: config.py
 # -----------------------------
 import os
-import random
+import time
+import itertools
+import threading
 from dotenv import load_dotenv
-from typing import List, Optional
+from typing import Collection, Dict, List, Optional, Tuple
 
 # Load environment variables from .env (if present)
 load_dotenv()
 
 
+def _parse_keys(raw: str) -> List[str]:
+    """Split a comma- or semicolon-separated key list, dropping blanks."""
+    # support both comma and semicolon separated lists
+    parts = [p.strip() for p in raw.replace(";", ",").split(",")]
+    return [p for p in parts if p]
+
+
 class Config:
     """Application configuration and API-key rotation utilities.
 
@@ -32,53 +41,99 @@ class Config:
 
     # Internal: parsed list of API keys
     _GEMINI_API_KEYS_RAW: str = os.getenv("GEMINI_API_KEYS", "")
+    # (raw string, parsed keys): parsed once rather than on every key lookup
+    _KEYS_CACHE: Optional[Tuple[str, List[str]]] = None
+    # ((raw keys, mock mode), error message or None) from the last validate()
+    _VALIDATE_CACHE: Optional[Tuple[Tuple[str, bool], Optional[str]]] = None
+    # Round-robin position shared by every caller of rotate_gemini_key()
+    _key_index = itertools.count()
+    _key_lock = threading.Lock()
+    # Keys recently rejected or rate-limited -> time.monotonic() they recover at
+    _unhealthy: Dict[str, float] = {}
     
     # GitHub token for private repository access
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN", None)
 
+    # Parsed JSON responses are reused for identical prompts for this many
+    # seconds (0 disables the cache); persisted so dev reloads keep them.
+    # Off by default; dev.py turns it on for the auto-reload loop
+    LLM_CACHE_TTL: float = float(os.getenv(
+        "LLM_CACHE_TTL", "86400" if os.getenv("AUTOPILOT_DEV") else "0"))
+    LLM_CACHE_FILE: str = os.getenv("LLM_CACHE_FILE", "llm_cache.json")
+    # Worker drafts for an identical request and analysis context are reused
+    # for this many seconds (0 disables); off by default, like LLM_CACHE_TTL
+    WORKER_CACHE_TTL: float = float(os.getenv(
+        "WORKER_CACHE_TTL", "1800" if os.getenv("AUTOPILOT_DEV") else "0"))
+
     # Publicly usable sequence of keys (list[str])
     @classmethod
     def GEMINI_API_KEYS(cls) -> List[str]:
         """Return a list of non-empty API keys.
 
         Accepts comma- or semicolon-separated lists from the env var.
-        Trims whitespace and ignores empty entries.
+        Trims whitespace and ignores empty entries. The parsed list is
+        shared between calls; treat it as read-only.
         """
         raw = cls._GEMINI_API_KEYS_RAW or ""
-        if not raw:
-            return []
-        # support both comma and semicolon separated lists
-        parts = [p.strip() for p in raw.replace(";", ",").split(",")]
-        return [p for p in parts if p]
+        cache = cls._KEYS_CACHE
+        if cache is None or cache[0] != raw:
+            cache = cls._KEYS_CACHE = (raw, _parse_keys(raw))
+        return cache[1]
+
+    @classmethod
+    def reload(cls) -> None:
+        """Re-read GEMINI_API_KEYS from the environment."""
+        cls._GEMINI_API_KEYS_RAW = os.getenv("GEMINI_API_KEYS", "")
+        cls._KEYS_CACHE = None
 
     @classmethod
     def validate(cls) -> None:
         """Validate configuration and raise on misconfiguration.
 
         If MOCK_MODE is enabled we allow missing keys. Otherwise at least one
-        key must be present.
+        key must be present. The outcome is reused until the keys or
+        MOCK_MODE change.
         """
-        keys = cls.GEMINI_API_KEYS()
-        if cls.MOCK_MODE:
-            # allow running without keys
-            return
-        if not keys:
-            raise ValueError(
-                "No GEMINI_API_KEYS configured. Set GEMINI_API_KEYS env or enable MOCK_MODE."
-            )
+        state = (cls._GEMINI_API_KEYS_RAW or "", cls.MOCK_MODE)
+        cache = cls._VALIDATE_CACHE
+        if cache is None or cache[0] != state:
+            error = None
+            # MOCK_MODE allows running without keys
+            if not cls.MOCK_MODE and not cls.GEMINI_API_KEYS():
+                error = "No GEMINI_API_KEYS configured. Set GEMINI_API_KEYS env or enable MOCK_MODE."
+            cache = cls._VALIDATE_CACHE = (state, error)
+        if cache[1] is not None:
+            raise ValueError(cache[1])
 
     @classmethod
-    def rotate_gemini_key(cls) -> str:
-        """Randomly pick an available Gemini API key.
+    def rotate_gemini_key(cls, exclude: Collection[str] = ()) -> str:
+        """Pick the next Gemini API key in round-robin order.
+
+        Keys in exclude (e.g. ones that already failed for this request) and
+        keys marked unhealthy are skipped. Unhealthy keys are still used once
+        no other key is left, and excluded ones once every key is excluded.
 
         Raises ValueError if there are no keys configured.
         """
         keys = cls.GEMINI_API_KEYS()
         if not keys:
             raise ValueError("No API keys available for rotation")
-        # random.choice is fine for simple rotation; if you prefer round-robin
-        # implement a persistent index (e.g. Redis/DB/file) instead.
-        return random.choice(keys)
+        now = time.monotonic()
+        with cls._key_lock:
+            unhealthy = {key for key, until in cls._unhealthy.items() if until > now}
+            # Prefer healthy untried keys, then any untried key, then any key
+            for skip in (unhealthy.union(exclude), exclude):
+                for _ in range(len(keys)):
+                    key = keys[next(cls._key_index) % len(keys)]
+                    if key not in skip:
+                        return key
+            return keys[next(cls._key_index) % len(keys)]
+
+    @classmethod
+    def mark_unhealthy(cls, key: str, backoff_s: float = 30.0) -> None:
+        """Skip key in rotate_gemini_key() for the next backoff_s seconds."""
+        with cls._key_lock:
+            cls._unhealthy[key] = time.monotonic() + backoff_s
 
     @classmethod
     def max_retries(cls) -> int:
@@ -1,7 +1,7 @@
 """
 Agent-to-Agent communication data structures.
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
 @dataclass
@@ -17,7 +17,8 @@ class PlannerOutput:
     save_preference: Optional[Dict[str, str]] = None 
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Flat fields: a shallow copy gives the same dict as asdict() without its recursion
+        return dict(self.__dict__)
 
 @dataclass
 class WorkerOutput:
@@ -26,7 +27,7 @@ class WorkerOutput:
     technique_applied: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return dict(self.__dict__)
 
 @dataclass
 class EvaluatorOutput:
@@ -35,4 +36,23 @@ class EvaluatorOutput:
     final_response: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
\ No newline at end of file
+        return dict(self.__dict__)
+
+@dataclass
+class AgentResult:
+    response: str
+    plan: Dict[str, Any]
+    safety_status: Optional[str]
+    tools_used: List[str] = field(default_factory=list)
+    conversation_stats: Dict[str, Any] = field(default_factory=dict)
+    logs: List[Dict[str, Any]] = field(default_factory=list)
+    visualizations: Dict[str, Any] = field(default_factory=dict)
+    dead_code_report: Dict[str, Any] = field(default_factory=dict)
+    migration_plan_report: Dict[str, Any] = field(default_factory=dict)
+    refactor_suggestions_report: List[Any] = field(default_factory=list)
+    duplicate_code_report: Dict[str, Any] = field(default_factory=dict)
+    postmortem_report: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Shallow copy: asdict() would deep-copy every PIL image in visualizations
+        return dict(self.__dict__)
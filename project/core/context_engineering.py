@@ -98,6 +98,20 @@ DO NOT exceed 500 words unless generating documentation.
 Always use code blocks for code examples.
 """
 
+# Appended to WORKER_PROMPT: static instructions live in the system prompt so
+# that every Worker request shares one cacheable prefix
+WORKER_REPORT_INSTRUCTIONS = """
+IMPORTANT INSTRUCTIONS:
+- The analysis has ALREADY BEEN PERFORMED by automated tools
+- Report on the ACTUAL results provided in the ANALYSIS CONTEXT of the request
+- Do NOT say you cannot execute code or use tools - the work is already done!
+- If complexity heatmap was generated, mention it in your response
+- If dependency graph was generated, mention it in your response
+- Provide insights based on the ACTUAL data, not hypothetical examples
+
+Generate a comprehensive DevOps response reporting on the completed analysis results.
+"""
+
 EVALUATOR_PROMPT = """
 You are a Strict Safety Evaluator for DevOps operations. Review the interaction for compliance.
 
@@ -1,6 +1,10 @@
 import os
+import io
+import re
 import time
 import json
+import hashlib
+import threading
 from typing import Optional, Dict, Any, List
 
 from google import genai
@@ -9,16 +13,129 @@ from google.genai import types
 from project.core.observability import logger
 from project.config import Config
 
+try:
+    # Optional: orjson parses responses several times faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Most responses kept in the response cache file
+LLM_CACHE_MAX_ENTRIES = 256
+
+# Retry settings, read from the environment once at import
+GEMINI_RETRY_DELAY = float(os.getenv("GEMINI_RETRY_DELAY", "1.0"))
+GEMINI_TOTAL_TIMEOUT = float(os.getenv("GEMINI_TOTAL_TIMEOUT", "20"))
+
+# Markdown code fences (``` or ```json) opening or closing a JSON response
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```\s*$", re.M)
+
+
+class _ResponseCache:
+    """JSON-file cache of model responses, each with its own expiry time.
+
+    Entries map a prompt hash to [expires_at, response]. The file is loaded on
+    first use and rewritten atomically whenever an entry is added.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._entries: Dict[str, list] = {}
+
+    def _load(self):
+        # Reload when tests or the environment point Config at another file
+        if self._path == Config.LLM_CACHE_FILE:
+            return
+        self._path = Config.LLM_CACHE_FILE
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() > entry[0]:
+                del self._entries[key]
+                return None
+            # Round-trip so callers can mutate the result without touching the cache
+            return json.loads(json.dumps(entry[1]))
+
+    def put(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._load()
+            now = time.time()
+            self._entries = {k: e for k, e in self._entries.items() if now <= e[0]}
+            self._entries[key] = [now + ttl, value]
+            # Dicts keep insertion order: drop the oldest entries first
+            for stale in list(self._entries)[:-LLM_CACHE_MAX_ENTRIES]:
+                del self._entries[stale]
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self._path)
+            except OSError as e:
+                logger.log("GeminiClient", f"Could not save response cache: {e}")
+
+
+_response_cache = _ResponseCache()
+
+# HTTP statuses meaning the key itself was refused or is rate-limited
+_KEY_ERROR_CODES = (401, 403, 429)
+
+
+def _is_key_error(error: Exception) -> bool:
+    """True when error was caused by the API key rather than the request."""
+    return getattr(error, "code", None) in _KEY_ERROR_CODES or "API_KEY_INVALID" in str(error)
+
+# One SDK client per API key, shared by every GeminiClient. Each holds an HTTP
+# connection pool, so reusing it keeps connections (and their TLS sessions)
+# alive across calls instead of handshaking again on every request.
+_sdk_clients: Dict[str, genai.Client] = {}
+_sdk_clients_lock = threading.Lock()
+
+
+def _sdk_client(api_key: str) -> genai.Client:
+    """Return the shared genai.Client for api_key, creating it on first use."""
+    with _sdk_clients_lock:
+        client = _sdk_clients.get(api_key)
+        if client is None:
+            client = _sdk_clients[api_key] = genai.Client(api_key=api_key)
+        return client
+
 
 class GeminiClient:
     """Robust Gemini client that rotates API keys and uses the new google-genai SDK."""
 
     def __init__(self, system_instruction: Optional[str] = None):
         self.system_instruction = system_instruction
-        
-        self.max_retries = Config.max_retries()
 
-        self.retry_delay = float(os.getenv("GEMINI_RETRY_DELAY", "1.0"))
+        self.retry_delay = GEMINI_RETRY_DELAY
+        # Upper bound on the time one generate_response call spends retrying
+        self.total_timeout = GEMINI_TOTAL_TIMEOUT
+
+        # Generation settings only depend on Config and the system instruction,
+        # so the text and JSON configs are built once per client
+        self.top_p = float(os.getenv("TOP_P", "0.95"))
+        config_args: Dict[str, Any] = {
+            "temperature": getattr(Config, "TEMPERATURE", 0.1),
+            "top_p": self.top_p,
+            "max_output_tokens": getattr(Config, "MAX_OUTPUT_TOKENS", 2048),
+        }
+
+        # FIX: Add system_instruction to config, NOT contents
+        if self.system_instruction:
+            config_args["system_instruction"] = self.system_instruction
+
+        self._text_config = types.GenerateContentConfig(**config_args)
+        self._json_config = types.GenerateContentConfig(**config_args, response_mime_type="application/json")
 
     def _build_contents(self, prompt: str) -> List[types.Content]:
         """Build the contents list. 
@@ -34,51 +151,46 @@ class GeminiClient:
     def generate_response(self, prompt: str, json_mode: bool = False, stream: bool = False) -> Optional[str]:
         """Generate a text response from Gemini."""
         
-        # Validate configuration first
+        # Validate configuration first; keys may be reloaded while the client is alive
         try:
             Config.validate()
         except Exception as e:
             logger.log("GeminiClient", f"Config validation failed: {e}")
             return None
+        # Usually one attempt per available key
+        max_retries = Config.max_retries()
 
-        for attempt in range(self.max_retries):
-            try:
-                # pick a key and create a client
-                api_key = Config.rotate_gemini_key()
-                logger.log("GeminiClient", f"Using configured API key (attempt {attempt + 1}/{self.max_retries})")
-
-                client = genai.Client(api_key=api_key)
+        # 1. Prepare Content (User prompt only) and Config
+        contents = self._build_contents(prompt)
+        generate_config = self._json_config if json_mode else self._text_config
 
-                # 1. Prepare Content (User prompt only)
-                contents = self._build_contents(prompt)
-
-                # 2. Prepare Config
-                config_args: Dict[str, Any] = {
-                    "temperature": getattr(Config, "TEMPERATURE", 0.1),
-                    "top_p": float(os.getenv("TOP_P", "0.95")),
-                    "max_output_tokens": getattr(Config, "MAX_OUTPUT_TOKENS", 2048),
-                }
-
-                # FIX: Add system_instruction to config, NOT contents
-                if self.system_instruction:
-                    config_args["system_instruction"] = self.system_instruction
-
-                if json_mode:
-                    config_args["response_mime_type"] = "application/json"
+        deadline = time.monotonic() + self.total_timeout
+        tried_keys = set()
+        for attempt in range(max_retries):
+            api_key = None
+            try:
+                # pick a key not yet tried for this prompt and create a client
+                api_key = Config.rotate_gemini_key(exclude=tried_keys)
+                tried_keys.add(api_key)
+                logger.log("GeminiClient", f"Using configured API key (attempt {attempt + 1}/{max_retries})")
 
-                generate_config = types.GenerateContentConfig(**config_args)
+                client = _sdk_client(api_key)
 
-                # 3. Generate
+                # 2. Generate
                 if stream:
-                    result_parts: List[str] = []
+                    # Chunks are appended to one growing buffer rather than
+                    # kept as a list of small strings until the end
+                    buffer = io.StringIO()
+                    usage = None
                     for chunk in client.models.generate_content_stream(
                         model=Config.MODEL_NAME,
                         contents=contents,
                         config=generate_config,
                     ):
                         if getattr(chunk, "text", None):
-                            result_parts.append(chunk.text)
-                    full_text = "".join(result_parts).strip()
+                            buffer.write(chunk.text)
+                        usage = getattr(chunk, "usage_metadata", None) or usage
+                    full_text = buffer.getvalue().strip()
                 else:
                     response = client.models.generate_content(
                         model=Config.MODEL_NAME,
@@ -86,6 +198,9 @@ class GeminiClient:
                         config=generate_config,
                     )
                     full_text = getattr(response, "text", None) or ""
+                    usage = getattr(response, "usage_metadata", None)
+
+                self._log_usage(usage)
 
                 if not full_text:
                     raise ValueError("Empty response from Gemini")
@@ -94,21 +209,80 @@ class GeminiClient:
 
             except Exception as e:
                 logger.log("GeminiClient", f"API error (attempt {attempt + 1}): {type(e).__name__}: {e}")
-                time.sleep(min(self.retry_delay * (2 ** attempt), 10))
+                if api_key is not None and _is_key_error(e):
+                    # Let other requests skip this key instead of failing on it too
+                    Config.mark_unhealthy(api_key)
+                remaining = deadline - time.monotonic()
+                if attempt == max_retries - 1 or remaining <= 0:
+                    break  # No retry left to wait for
+                time.sleep(min(self.retry_delay * (2 ** attempt), remaining, 10))
 
         logger.log("GeminiClient", "All retries failed.")
         return None
 
-    def generate_json(self, prompt: str) -> Optional[Dict[str, Any]]:
-        """Request a JSON response and parse it into a Python dict."""
+    def _log_usage(self, usage) -> None:
+        """Log prompt tokens and how many were served from Gemini's prefix cache."""
+        if usage is None:
+            return
+        logger.log("GeminiClient", "Token usage", data={
+            "prompt_tokens": getattr(usage, "prompt_token_count", None),
+            # Implicit caching reuses a prompt prefix (system instruction first)
+            # already seen by the model; non-zero means a cache hit
+            "cached_tokens": getattr(usage, "cached_content_token_count", None) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", None),
+        })
+
+    def _cache_key(self, kind: str, prompt: str) -> str:
+        """Hash everything that shapes a response to prompt into a cache key."""
+        return hashlib.sha256(json.dumps([
+            kind, Config.MODEL_NAME, Config.TEMPERATURE, self.top_p,
+            Config.MAX_OUTPUT_TOKENS, self.system_instruction, prompt,
+        ]).encode("utf-8")).hexdigest()
+
+    def generate_cached_response(self, prompt: str, ttl: float) -> Optional[str]:
+        """Generate a text response, reusing the answer to the same prompt from the last ttl seconds."""
+        if ttl <= 0:
+            return self.generate_response(prompt)
+
+        cache_key = self._cache_key("text", prompt)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            logger.log("GeminiClient", "Using cached response")
+            return cached
+
+        response_text = self.generate_response(prompt)
+        if response_text:
+            _response_cache.put(cache_key, response_text, ttl)
+        return response_text
+
+    def generate_json(self, prompt: str, cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Request a JSON response and parse it into a Python dict.
+
+        Unless cache is False, responses to a prompt already answered within
+        Config.LLM_CACHE_TTL seconds are served from the response cache
+        without calling Gemini.
+        """
+        cache_key = None
+        if cache and Config.LLM_CACHE_TTL > 0:
+            cache_key = self._cache_key("json", prompt)
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                logger.log("GeminiClient", "Using cached JSON response")
+                return cached
+
         response_text = self.generate_response(prompt, json_mode=True, stream=False)
         if not response_text:
             return None
 
         # Remove common fences or markdown codeblocks if present
-        cleaned = response_text.replace("```json", "").replace("```", "").strip()
+        cleaned = _FENCE_RE.sub("", response_text).strip()
         try:
-            return json.loads(cleaned)
+            # orjson's decode error subclasses json.JSONDecodeError
+            parsed = _json_loads(cleaned)
         except json.JSONDecodeError as e:
-            logger.log("GeminiClient", f"JSON parsing error: {e}. Response was: {cleaned}")
-            return None
\ No newline at end of file
+            logger.log("GeminiClient", f"JSON parsing error: {e}. Response began: {cleaned[:200]}")
+            return None
+
+        if cache_key is not None:
+            _response_cache.put(cache_key, parsed, Config.LLM_CACHE_TTL)
+        return parsed
\ No newline at end of file
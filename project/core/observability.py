@@ -3,25 +3,87 @@ Enhanced observability module for logging agent activities.
 Supports console output, log levels, and optional file logging.
 """
 
+import os
+import time
+import queue
+import atexit
 import datetime
+import itertools
 import threading
+import logging
+import logging.handlers
+from collections import deque
 from typing import Optional, Any, Dict
 import json
 
+try:
+    # Optional: orjson serializes log data several times faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+# Most log entries kept in memory for get_logs(); older ones are dropped
+LOG_RING_SIZE = int(os.getenv("LOG_RING_SIZE", "10000"))
+# The log file rotates at this size, keeping LOG_FILE_BACKUPS old files
+LOG_FILE_MAX_BYTES = 5_000_000
+LOG_FILE_BACKUPS = 3
+# Entries below this level are dropped before their data is serialized
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+_LEVEL_ORDER = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+def _dump_data(data: Any) -> str:
+    """Serialize log data as compact JSON, stringifying unknown types."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, separators=(",", ":"), default=str)
+
 class Logger:
-    def __init__(self, log_to_file: bool = False, log_file: str = "agent_logs.txt"):
-        self.logs = []
+    def __init__(self, log_to_file: bool = False, log_file: str = "agent_logs.txt",
+                 min_level: str = LOG_LEVEL):
+        self.logs = deque(maxlen=LOG_RING_SIZE)
+        self.min_level = _LEVEL_ORDER.get(min_level, 0)
+        # Per-level and total entry counts, kept up to date by log() for
+        # get_stats(); unlike logs they include entries pushed out of the ring
+        self._level_counts = {"INFO": 0, "ERROR": 0, "WARNING": 0, "DEBUG": 0}
+        self._total = 0
         self.log_to_file = log_to_file
         self.log_file = log_file
         self._lock = threading.Lock()  # Thread safety
+        # Console and file output happen on a background thread fed by this
+        # queue, so callers never wait on I/O; started on the first entry
+        self._io_queue = queue.SimpleQueue()
+        self._io_thread: Optional[threading.Thread] = None
+        # Once per logger: the thread may be started again, e.g. after a fork
+        atexit.register(self.flush)
+        # (second, "HH:MM:SS"): entries logged within the same second share it
+        self._ts_cache = (0, "")
         self._setup_file_logging()
     
     def _setup_file_logging(self):
-        """Initialize log file if enabled."""
+        """Initialize log file if enabled.
+        
+        Entries go through a buffered, size-rotated stdlib logging handler
+        rather than reopening the file for every line.
+        """
+        self._file_log = None
         if self.log_to_file:
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write(f"=== Mental Health Companion Logs ===\n")
                 f.write(f"Started: {datetime.datetime.now().isoformat()}\n\n")
+            
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_file, maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            # One stdlib logger per file; entries are already formatted
+            self._file_log = logging.getLogger(f"autopilot.{os.path.abspath(self.log_file)}")
+            self._file_log.setLevel(logging.DEBUG)
+            self._file_log.propagate = False
+            for old_handler in self._file_log.handlers[:]:
+                self._file_log.removeHandler(old_handler)
+                old_handler.close()
+            self._file_log.addHandler(handler)
     
     def log(self, agent_name: str, message: str, data: Optional[Any] = None, level: str = "INFO"):
         """
@@ -33,7 +95,14 @@ class Logger:
             data: Optional additional data (will be JSON-serialized)
             level: Log level (INFO, WARNING, ERROR, DEBUG)
         """
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        if _LEVEL_ORDER.get(level, self.min_level) < self.min_level:
+            return
+        
+        now = int(time.time())
+        ts_cache = self._ts_cache
+        if ts_cache[0] != now:
+            ts_cache = self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        timestamp = ts_cache[1]
         
         # Format log entry
         entry = f"[{timestamp}] {level:<5} {agent_name}: {message}"
@@ -41,9 +110,9 @@ class Logger:
         # Add data if provided
         if data is not None:
             try:
-                # Serialize data nicely
+                # Serialize dicts as compact JSON
                 if isinstance(data, dict):
-                    data_str = json.dumps(data, indent=2)
+                    data_str = _dump_data(data)
                 else:
                     data_str = str(data)
                 entry += f"\n{' '*20} Data: {data_str}"
@@ -52,20 +121,51 @@ class Logger:
         
         # Thread-safe logging
         with self._lock:
-            # Print to console (always)
-            print(entry)
-            
             # Store in memory
             self.logs.append(entry)
+            self._level_counts[level] = self._level_counts.get(level, 0) + 1
+            self._total += 1
             
-            # Write to file if enabled
-            if self.log_to_file:
+            # Print to console (always) and write to file if enabled, in
+            # the background but in the same order as stored
+            if self._io_thread is None or not self._io_thread.is_alive():
+                self._start_io_thread()
+            self._io_queue.put((timestamp, level, entry))
+    
+    def _start_io_thread(self):
+        """Start the output thread (again, e.g. in a forked child)."""
+        self._io_thread = threading.Thread(target=self._drain, name="LoggerIO", daemon=True)
+        self._io_thread.start()
+    
+    def _drain(self):
+        """Write queued entries to the console and log file, in order."""
+        while True:
+            item = self._io_queue.get()
+            if isinstance(item, threading.Event):
+                # flush() marker: everything queued before it has been written
+                if self._file_log is not None:
+                    for handler in self._file_log.handlers:
+                        handler.flush()
+                item.set()
+                continue
+            
+            timestamp, level, entry = item
+            print(entry)
+            if self._file_log is not None:
                 try:
-                    with open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(entry + "\n")
+                    levelno = logging.getLevelName(level)
+                    self._file_log.log(levelno if isinstance(levelno, int) else logging.INFO, entry)
                 except Exception as e:
                     print(f"[{timestamp}] ERROR Logger: Failed to write to log file: {e}")
     
+    def flush(self, timeout: Optional[float] = 5.0):
+        """Wait until every entry logged so far has been printed and written."""
+        if self._io_thread is None or not self._io_thread.is_alive():
+            return
+        written = threading.Event()
+        self._io_queue.put(written)
+        written.wait(timeout)
+    
     def info(self, agent_name: str, message: str, data: Optional[Any] = None):
         """Convenience method for INFO level logs."""
         self.log(agent_name, message, data, level="INFO")
@@ -89,30 +189,35 @@ class Logger:
         Args:
             last_n: Number of recent logs to return (None for all)
         """
+        # Only copy the entries under the lock; joining them can happen outside
         with self._lock:
             if last_n:
-                logs_to_return = self.logs[-last_n:]
+                # Walk back from the newest entry: O(last_n), not O(len(logs))
+                logs_to_return = list(itertools.islice(reversed(self.logs), last_n))
+                logs_to_return.reverse()
             else:
-                logs_to_return = self.logs
-            
-            return "\n".join(logs_to_return)
+                logs_to_return = list(self.logs)
+        
+        return "\n".join(logs_to_return)
     
     def clear(self):
         """Clear all logs from memory."""
         with self._lock:
             self.logs.clear()
+            self._level_counts = dict.fromkeys(self._level_counts, 0)
+            self._total = 0
     
     def get_stats(self) -> Dict[str, int]:
-        """Get logging statistics."""
+        """Get logging statistics.
+
+        total_logs and by_level count every entry since the last clear();
+        stored_logs is how many of them are still held in memory.
+        """
         with self._lock:
             return {
-                "total_logs": len(self.logs),
-                "by_level": {
-                    "INFO": sum(1 for log in self.logs if " INFO " in log),
-                    "ERROR": sum(1 for log in self.logs if " ERROR " in log),
-                    "WARNING": sum(1 for log in self.logs if " WARNING " in log),
-                    "DEBUG": sum(1 for log in self.logs if " DEBUG " in log)
-                }
+                "total_logs": self._total,
+                "stored_logs": len(self.logs),
+                "by_level": dict(self._level_counts)
             }
 
 # Singleton instance for global use
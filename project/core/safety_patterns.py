@@ -0,0 +1,89 @@
+"""
+Shared safety patterns for the Planner and Evaluator guardrails.
+
+Each pattern list is compiled once, at import, into a single case-insensitive
+alternation so a text is checked in one pass instead of once per pattern.
+"""
+import re
+
+try:
+    # Optional: RE2 matches the alternations as an automaton in time linear in
+    # the text length, with no backtracking on the .* patterns
+    import re2 as _engine
+except ImportError:
+    _engine = re
+
+# Destructive operations checked on both user requests (Planner) and drafts (Evaluator)
+SHARED_DESTRUCTIVE_PATTERNS = [
+    r"rm\s+-rf",                    # File deletion
+    r"delete\s+.*file",             # File deletion commands
+    r"DROP\s+TABLE",                # Database drops
+    r"format\s+disk",               # Disk formatting
+    r"shutdown",                    # System shutdown
+    r"sudo\s+",                     # Sudo commands
+    r"systemctl\s+(stop|restart|disable)",  # System service control
+    r"kubectl\s+delete",            # Kubernetes deletion
+    r"chmod\s+777",                 # Unsafe permissions
+    r"uninstall",                   # Uninstallation
+    r"destroy",                     # Destruction commands
+]
+
+# Only checked on user requests
+PLANNER_DESTRUCTIVE_PATTERNS = [
+    r"remove\s+.*directory",        # Directory removal
+]
+
+# Only checked on drafts. Too broad for free-form requests: users ask about
+# "kill -9" signals or "DROP DATABASE" errors in their logs, and "rm\s+.*-r"
+# matches ordinary words ("platform ... re-run")
+EVALUATOR_DESTRUCTIVE_PATTERNS = [
+    r"rm\s+.*-r",                   # Recursive deletion
+    r"DROP\s+DATABASE",             # Database deletion
+    r"TRUNCATE\s+TABLE",            # Table truncation
+    r"DELETE\s+FROM.*WHERE\s+1=1",  # Mass deletion
+    r"chmod\s+.*-R\s+777",          # Recursive unsafe permissions
+    r"kill\s+-9",                   # Force kill
+    r"pkill\s+-9",                  # Process kill
+]
+
+# Code that runs commands: only banned in drafts, since users may ask about it
+CODE_EXECUTION_PATTERNS = [
+    r"exec\s+",                     # Execution commands
+    r"subprocess\.(call|run|Popen)", # Python subprocess execution
+    r"os\.system",                  # OS system calls
+    r"os\.popen",                   # OS popen
+    r"eval\s*\(",                   # Eval execution
+    r"exec\s*\(",                   # Exec execution
+    r"__import__",                  # Dynamic imports (potentially unsafe)
+]
+
+# Shell/subprocess execution in drafts, tolerated next to a warning
+EXECUTION_PATTERNS = [
+    r"subprocess\.",
+    r"os\.system",
+    r"os\.popen",
+    r"eval\s*\(",
+    r"exec\s*\(",
+    r"bash\s+-c",
+    r"sh\s+-c",
+    r"python\s+-c",
+    r"\.run\s*\(",
+    r"\.call\s*\(",
+]
+
+
+def compile_any(patterns):
+    """Compile patterns into one case-insensitive regex matching any of them."""
+    # Inline (?i) rather than re.IGNORECASE: both re and re2 accept it
+    return _engine.compile("(?i)" + "|".join(f"(?:{p})" for p in patterns))
+
+
+PLANNER_DESTRUCTIVE_RE = compile_any(SHARED_DESTRUCTIVE_PATTERNS + PLANNER_DESTRUCTIVE_PATTERNS)
+BANNED_RE = compile_any(SHARED_DESTRUCTIVE_PATTERNS + EVALUATOR_DESTRUCTIVE_PATTERNS
+                        + CODE_EXECUTION_PATTERNS)
+EXECUTION_RE = compile_any(EXECUTION_PATTERNS)
+
+# Refusal context like "I cannot delete" or "do not execute"
+REFUSAL_CONTEXT_RE = re.compile(r"cannot|do not|refuse|not allowed", re.IGNORECASE)
+# Code examples shown with a warning
+CAUTION_CONTEXT_RE = re.compile(r"warning|do not|avoid", re.IGNORECASE)
@@ -10,6 +10,7 @@ from project.memory.long_term_memory import LongTermMemory # NEW IMPORT
 from project.tools.github_tools import GitHubTools
 from project.core.observability import logger
 from project.config import Config
+from project.core.a2a_protocol import AgentResult
 from typing import Dict, Optional
 
 class MainAgent:
@@ -29,12 +30,25 @@ class MainAgent:
         
         logger.log("MainAgent", f"Initialized in {'MOCK' if self.mock_mode else 'LIVE'} mode")
     
-    def handle_message(self, user_input: str, repo_url: Optional[str] = None) -> Dict:
+    def handle_message(self, user_input: str, repo_url: Optional[str] = None,
+                       github_token: Optional[str] = None) -> Dict:
+        """Process a single user message through the pipeline and return the result as a dict.
+        
+        Args:
+            user_input: User's message/request
+            repo_url: Optional GitHub repository URL to analyze
+            github_token: Optional per-session GitHub token; defaults to Config.GITHUB_TOKEN
+        """
+        return self.run(user_input, repo_url=repo_url, github_token=github_token).to_dict()
+    
+    def run(self, user_input: str, repo_url: Optional[str] = None,
+            github_token: Optional[str] = None) -> AgentResult:
         """Process a single user message through the pipeline.
         
         Args:
             user_input: User's message/request
             repo_url: Optional GitHub repository URL to analyze
+            github_token: Optional per-session GitHub token; defaults to Config.GITHUB_TOKEN
         """
         logger.log("System", "Processing new message", 
                    data={"input_preview": user_input[:50] + "...", "repo_url": repo_url})
@@ -42,10 +56,11 @@ class MainAgent:
         try:
             # 0. Handle GitHub repository cloning if URL provided or detected
             repo_path = "."
+            github_token = github_token or Config.GITHUB_TOKEN
             if repo_url:
                 clone_result = GitHubTools.clone_repository(
                     repo_url, 
-                    github_token=Config.GITHUB_TOKEN
+                    github_token=github_token
                 )
                 if clone_result.get("success"):
                     repo_path = clone_result["local_path"]
@@ -60,7 +75,7 @@ class MainAgent:
                 if github_url:
                     clone_result = GitHubTools.clone_repository(
                         github_url,
-                        github_token=Config.GITHUB_TOKEN
+                        github_token=github_token
                     )
                     if clone_result.get("success"):
                         repo_path = clone_result["local_path"]
@@ -100,52 +115,14 @@ class MainAgent:
             worker_res = self.worker.work(plan)
             
             # 5. Extract visualization data from worker (stored in _last_analysis_results)
+            analysis_results = getattr(self.worker, '_last_analysis_results', None)
+            # Read once per turn: don't keep the charts alive until the next request
+            self.worker.reset()
             visualizations = {}
-            if hasattr(self.worker, '_last_analysis_results'):
-                analysis_results = getattr(self.worker, '_last_analysis_results', {})
-                # Extract visualizations from the nested structure
-                if isinstance(analysis_results, dict):
-                    # Visualizations are stored in analysis_results["visualizations"]
-                    visualizations = analysis_results.get("visualizations", {})
-                    # Also check if visualizations are at the top level (for backward compatibility)
-                    if not visualizations:
-                        # Check for direct visualization keys
-                        for key in ["dependency_graph_image", "complexity_heatmap"]:
-                            if key in analysis_results:
-                                if not visualizations:
-                                    visualizations = {}
-                                visualizations[key] = analysis_results[key]
-                
-                # Debug: Log what visualizations are available
-                logger.log("MainAgent", f"Extracted visualizations: {list(visualizations.keys())}", level="INFO")
-                if "dependency_graph_image" in visualizations:
-                    img = visualizations["dependency_graph_image"]
-                    logger.log("MainAgent", f"Dependency graph image type: {type(img)}, has save: {hasattr(img, 'save')}", level="INFO")
-                if "complexity_heatmap" in visualizations:
-                    img = visualizations["complexity_heatmap"]
-                    logger.log("MainAgent", f"Complexity heatmap image type: {type(img)}, has save: {hasattr(img, 'save')}", level="INFO")
-                if "error_timeline" in visualizations:
-                    img = visualizations["error_timeline"]
-                    logger.log("MainAgent", f"Error timeline image type: {type(img)}, has save: {hasattr(img, 'save')}", level="INFO")
-                else:
-                    # Check for timeline in nested structures in analysis_results
-                    logger.log("MainAgent", f"Timeline not in visualizations, searching analysis_results. Keys: {list(analysis_results.keys())[:10]}", level="INFO")
-                    for key, value in list(analysis_results.items()):
-                        if "_timeline" in key and hasattr(value, 'save'):
-                            if not visualizations:
-                                visualizations = {}
-                            visualizations["error_timeline"] = value
-                            logger.log("MainAgent", f"Found timeline in analysis_results: {key}", level="INFO")
-                            break
-                        elif isinstance(value, dict):
-                            # Check nested dicts (like log file results)
-                            for sub_key, sub_value in value.items():
-                                if "_timeline" in sub_key and hasattr(sub_value, 'save'):
-                                    if not visualizations:
-                                        visualizations = {}
-                                    visualizations["error_timeline"] = sub_value
-                                    logger.log("MainAgent", f"Found timeline in nested structure: {key}.{sub_key}", level="INFO")
-                                    break
+            if isinstance(analysis_results, dict):
+                # The Worker keeps every chart in analysis_results["visualizations"]
+                visualizations = analysis_results.get("visualizations", {})
+            logger.log("MainAgent", f"Extracted visualizations: {list(visualizations.keys())}", level="INFO")
             
             # 6. Evaluator (Check Output vs Input)
             eval_res = self.evaluator.evaluate(worker_res, user_input)
@@ -156,56 +133,68 @@ class MainAgent:
             self.memory.add_message("assistant", final_response)
             
             # 7. Extract reports from analysis_results (dead_code, migration_plan, etc.)
-            dead_code_report = {}
-            migration_plan_report = {}
-            refactor_suggestions_report = []
-            duplicate_code_report = {}
-            postmortem_report = {}
-            
-            if hasattr(self.worker, '_last_analysis_results'):
-                analysis_results = getattr(self.worker, '_last_analysis_results', {})
-                if isinstance(analysis_results, dict):
-                    # Extract reports from top level
-                    dead_code_report = analysis_results.get("dead_code", {})
-                    migration_plan_report = analysis_results.get("migration_plan", {})
-                    refactor_suggestions_report = analysis_results.get("refactor_suggestions", [])
-                    duplicate_code_report = analysis_results.get("duplicates", {})
-                    
-                    # Postmortem might be in nested log file results
-                    for key, value in analysis_results.items():
-                        if isinstance(value, dict) and "postmortem" in value:
-                            postmortem_report = value.get("postmortem", {})
-                            break
+            reports = self._extract_reports(analysis_results)
             
             # 8. Compile results
-            return {
-                "response": final_response,
-                "plan": plan,
-                "tools_used": worker_res.get("tools_used", []),
-                "safety_status": eval_res.get("status"),
-                "conversation_stats": self.memory.get_stats(),
-                "logs": logger.get_logs(),
-                "visualizations": visualizations,  # Include visualizations
-                "dead_code_report": dead_code_report,
-                "migration_plan_report": migration_plan_report,
-                "refactor_suggestions_report": refactor_suggestions_report,
-                "duplicate_code_report": duplicate_code_report,
-                "postmortem_report": postmortem_report
-            }
+            return AgentResult(
+                response=final_response,
+                plan=plan,
+                tools_used=worker_res.get("tools_used", []),
+                safety_status=eval_res.get("status"),
+                conversation_stats=self.memory.get_stats(),
+                logs=logger.get_logs(),
+                visualizations=visualizations,  # Include visualizations
+                dead_code_report=reports["dead_code"],
+                migration_plan_report=reports["migration_plan"],
+                refactor_suggestions_report=reports["refactor_suggestions"],
+                duplicate_code_report=reports["duplicates"],
+                postmortem_report=reports["postmortem"]
+            )
             
         except Exception as e:
             logger.log("MainAgent", f"Pipeline error: {e}")
             error_response = "I apologize, but I'm experiencing technical difficulties. Please try again later."
             self.memory.add_message("assistant", error_response)
             
-            return {
-                "response": error_response,
-                "plan": {"emotion": "error", "risk_level": "LOW", "action": "general_chat", "task_type": "general_chat"},
-                "tools_used": [],
-                "safety_status": "REJECTED",
-                "conversation_stats": self.memory.get_stats(),
-                "logs": logger.get_logs()
-            }
+            return AgentResult(
+                response=error_response,
+                plan={"emotion": "error", "risk_level": "LOW", "action": "general_chat", "task_type": "general_chat"},
+                safety_status="REJECTED",
+                conversation_stats=self.memory.get_stats(),
+                logs=logger.get_logs()
+            )
+    
+    def _extract_reports(self, analysis_results) -> Dict:
+        """Collect the tab reports from worker analysis results.
+        
+        Reports are looked up at the top level first, then one level down
+        (e.g. per-log-file results holding a postmortem).
+        """
+        reports = {
+            "dead_code": {},
+            "migration_plan": {},
+            "refactor_suggestions": [],
+            "duplicates": {},
+            "postmortem": {},
+        }
+        if not isinstance(analysis_results, dict):
+            return reports
+        
+        for name, default in reports.items():
+            value = analysis_results.get(name)
+            if type(value) is type(default):
+                reports[name] = value
+        
+        for value in analysis_results.values():
+            if type(value) is not dict:
+                continue
+            for name, current in reports.items():
+                if not current:
+                    nested = value.get(name)
+                    if nested is not None:
+                        reports[name] = nested
+        
+        return reports
     
     def get_conversation_summary(self) -> str:
         return self.memory.get_conversation_summary()
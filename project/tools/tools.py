@@ -6,13 +6,108 @@ import os
 import re
 import json
 import ast
+import sqlite3
+import hashlib
 import warnings
+import functools
+import threading
 from typing import Dict, List, Optional
 from collections import defaultdict, Counter
+from itertools import islice
 
 # Suppress SyntaxWarnings from analyzed code (e.g., invalid escape sequences in test files)
 warnings.filterwarnings('ignore', category=SyntaxWarning, module='ast')
 
+# Tool results are memoized here, one row per tool call, checked against the
+# stat of the files it read (empty disables). SQLite lets the analysis
+# threads and app restarts share it.
+TOOL_CACHE_DIR = os.getenv("TOOL_CACHE_DIR", ".autopilot_cache")
+_MEMO_IGNORE_DIRS = {'.git', '__pycache__', 'venv', 'node_modules'}
+_memo_local = threading.local()
+
+
+def _memo_db() -> Optional[sqlite3.Connection]:
+    """Return this thread's connection to the memo database, or None if disabled."""
+    if not TOOL_CACHE_DIR:
+        return None
+    path = os.path.join(TOOL_CACHE_DIR, "tools.sqlite")
+    # Connections cannot cross threads (the analysis pool runs tools on several)
+    if getattr(_memo_local, "owner", None) != (os.getpid(), path):
+        os.makedirs(TOOL_CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Rows of the old layout were keyed on the whole fingerprint
+        conn.execute("DROP TABLE IF EXISTS memo")
+        conn.execute("CREATE TABLE IF NOT EXISTS tool_memo "
+                     "(key TEXT PRIMARY KEY, fingerprint TEXT, value TEXT)")
+        _memo_local.conn, _memo_local.owner = conn, (os.getpid(), path)
+    return _memo_local.conn
+
+
+def _file_fingerprint(path: str) -> List:
+    """(mtime, size) of a file: changes whenever the file is written."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _tree_fingerprint(root_path: str) -> List:
+    """(path, mtime, size) of every Python file under root_path: changes when any of them does."""
+    entries = []
+    for root, dirs, files in os.walk(root_path):
+        dirs[:] = [d for d in dirs if d not in _MEMO_IGNORE_DIRS]
+        for file in files:
+            if file.endswith('.py'):
+                file_path = os.path.join(root, file)
+                entries.append([file_path] + _file_fingerprint(file_path))
+    return sorted(entries)
+
+
+def _memoize(fingerprint):
+    """Memoize a tool on fingerprint(path) so unchanged files are not parsed again.
+    
+    Each call (tool, path, arguments) keeps one row holding a hash of the
+    fingerprint its result was computed for; a stale row is overwritten, so
+    the database only grows with the number of distinct calls.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(path, *args, **kwargs):
+            try:
+                db = _memo_db()
+                if db:
+                    key = json.dumps([func.__name__, os.path.abspath(path), args, kwargs], sort_keys=True)
+                    digest = hashlib.blake2b(json.dumps(fingerprint(path)).encode("utf-8"),
+                                             digest_size=16).hexdigest()
+                else:
+                    key = digest = None
+            except (OSError, sqlite3.Error):
+                db = key = digest = None  # Missing file or unusable cache: just run the tool
+            if key:
+                try:
+                    row = db.execute("SELECT fingerprint, value FROM tool_memo WHERE key = ?", (key,)).fetchone()
+                    if row and row[0] == digest:
+                        return json.loads(row[1])
+                except sqlite3.Error:
+                    pass
+            
+            result = func(path, *args, **kwargs)
+            
+            if key:
+                try:
+                    with db:
+                        db.execute("INSERT OR REPLACE INTO tool_memo VALUES (?, ?, ?)",
+                                   (key, digest, json.dumps(result)))
+                except (sqlite3.Error, TypeError, ValueError):
+                    pass
+            return result
+        return wrapper
+    return decorator
+
+
+# Keyed on the file's own mtime and size, or on every Python file in a tree
+file_memoize = _memoize(_file_fingerprint)
+tree_memoize = _memoize(_tree_fingerprint)
+
 
 class Tools:
     """DevOps and code intelligence tools for repository analysis."""
@@ -113,6 +208,7 @@ class Tools:
         return count
     
     @staticmethod
+    @file_memoize
     def extract_imports(file_path: str) -> Dict:
         """Extract imports from a Python file.
         
@@ -219,6 +315,7 @@ class Tools:
         }
     
     @staticmethod
+    @file_memoize
     def compute_complexity(file_path: str) -> Dict:
         """Calculate cyclomatic complexity for a Python file.
         
@@ -294,6 +391,7 @@ class Tools:
             }
     
     @staticmethod
+    @tree_memoize
     def detect_dead_code(root_path: str = ".") -> Dict:
         """Detect potentially unused functions and imports.
         
@@ -403,8 +501,12 @@ class Tools:
         Returns:
             Dict with 'entries', 'errors', 'warnings', 'info', 'timestamps'
         """
-        file_data = Tools.read_file(log_file)
-        if not file_data["exists"]:
+        # Only the first max_lines lines are analyzed, so stream just those
+        # instead of reading (and splitting) the whole log into memory
+        try:
+            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = [line.rstrip('\r\n') for line in islice(f, max_lines)]
+        except OSError:
             return {
                 "entries": [],
                 "errors": [],
@@ -414,7 +516,6 @@ class Tools:
                 "error": "Log file not found"
             }
         
-        lines = file_data["content"].splitlines()[:max_lines]
         entries = []
         errors = []
         warnings = []
@@ -671,6 +772,7 @@ class Tools:
         }
     
     @staticmethod
+    @tree_memoize
     def detect_duplicate_code(root_path: str = ".", min_lines: int = 5) -> Dict:
         """Detect duplicate code blocks across files.
         
@@ -3,26 +3,132 @@ Visualization tools for dependency graphs, heatmaps, and timelines.
 """
 import os
 import io
+import hashlib
+import functools
+import threading
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from PIL import Image
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime
-import seaborn as sns
-import networkx as nx
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.facecolor'] = 'white'
+
+# matplotlib, seaborn and networkx take a few hundred milliseconds to import
+# and are only needed once a chart is drawn, so they are imported on the
+# first render rather than whenever the agents are loaded.
+@functools.cache
+def _pyplot():
+    """Import pyplot with the Agg backend and apply the shared chart style."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.facecolor'] = 'white'
+    return plt
+
+# One PNG buffer reused for every chart instead of allocating a BytesIO per
+# call. Charts can be rendered from several handler threads, hence the lock.
+_PNG_BUF = io.BytesIO()
+_PNG_LOCK = threading.Lock()
+
+# Rendered charts keyed on their input data. Re-analyzing an unchanged
+# repository produces identical dependency and complexity data, so the
+# layout, draw and PNG round trip can be skipped entirely.
+_RENDER_CACHE: "OrderedDict[bytes, Image.Image]" = OrderedDict()
+_RENDER_CACHE_SIZE = 32
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def _cached_render(render):
+    """Memoize a chart renderer on the repr of its arguments (LRU-bounded)."""
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        key = hashlib.blake2b(
+            repr((render.__name__, args, sorted(kwargs.items()))).encode(),
+            digest_size=16,
+        ).digest()
+        with _RENDER_CACHE_LOCK:
+            image = _RENDER_CACHE.get(key)
+            if image is not None:
+                _RENDER_CACHE.move_to_end(key)
+                return image
+        image = render(*args, **kwargs)
+        with _RENDER_CACHE_LOCK:
+            _RENDER_CACHE[key] = image
+            if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+                _RENDER_CACHE.popitem(last=False)
+        return image
+    return wrapper
 
 
 class Visualizations:
     """Visualization utilities for DevOps analysis."""
     
     @staticmethod
+    def _figure_to_image(fig=None) -> Image.Image:
+        """Render a figure to a PIL Image.
+        
+        Args:
+            fig: Figure from _text_figure(); defaults to the current pyplot
+                figure, which is closed afterwards
+            
+        Returns:
+            PIL Image decoded from the shared PNG buffer
+        """
+        plt = _pyplot() if fig is None else None
+        with _PNG_LOCK:
+            _PNG_BUF.seek(0)
+            _PNG_BUF.truncate(0)
+            (fig or plt).savefig(_PNG_BUF, format='png', dpi=100, bbox_inches='tight', 
+                                 facecolor='#1a1a1a', edgecolor='none')
+            if fig is None:
+                plt.close()
+            _PNG_BUF.seek(0)
+            # Image.open is lazy; copy() decodes now, before the buffer is reused
+            return Image.open(_PNG_BUF).copy()
+    
+    @staticmethod
+    def _text_figure(figsize: Tuple[int, int]):
+        """Create a dark, axis-less figure for a text-only chart.
+        
+        The Figure is attached straight to an Agg canvas rather than created
+        through pyplot, so it skips pyplot's global figure registry and style
+        setup and never needs plt.close().
+        
+        Returns:
+            (Figure, Axes) tuple
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        fig = Figure(figsize=figsize, facecolor='#1a1a1a')
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        ax.set_facecolor('#1a1a1a')
+        ax.axis('off')
+        return fig, ax
+    
+    @staticmethod
+    @_cached_render
+    def error_placeholder(message: str, figsize: Tuple[int, int] = (8, 6)) -> Image.Image:
+        """Render an error message as a dark placeholder chart.
+        
+        Args:
+            message: Text shown in the middle of the image
+            figsize: Figure size in inches
+            
+        Returns:
+            PIL Image of the message
+        """
+        fig, ax = Visualizations._text_figure(figsize)
+        ax.text(0.5, 0.5, message,
+               horizontalalignment='center', verticalalignment='center',
+               transform=ax.transAxes, color='#ff6b6b', fontsize=12)
+        return Visualizations._figure_to_image(fig)
+    
+    @staticmethod
+    @_cached_render
     def plot_dependency_graph(dependency_data: Dict, max_nodes: int = 50) -> Image.Image:
         """Create a visual dependency graph from dependency data.
         
@@ -33,6 +139,9 @@ class Visualizations:
         Returns:
             PIL Image of the dependency graph
         """
+        plt = _pyplot()
+        import networkx as nx
+
         G = nx.DiGraph()
         
         nodes = dependency_data.get("nodes", [])[:max_nodes]
@@ -91,16 +200,11 @@ class Visualizations:
             ax.axis('off')
         
         # Convert to PIL Image
-        buf = io.BytesIO()
         plt.tight_layout()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                   facecolor='#1a1a1a', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        
-        return Image.open(buf)
+        return Visualizations._figure_to_image()
     
     @staticmethod
+    @_cached_render
     def plot_complexity_heatmap(complexity_data: List[Dict], max_files: int = 50) -> Image.Image:
         """Create a heatmap showing complexity across files.
         
@@ -113,17 +217,13 @@ class Visualizations:
         """
         if not complexity_data:
             # Return empty plot with dark mode
-            fig, ax = plt.subplots(figsize=(10, 6), facecolor='#1a1a1a')
-            ax.set_facecolor('#1a1a1a')
+            fig, ax = Visualizations._text_figure((10, 6))
             ax.text(0.5, 0.5, 'No complexity data available.\nRun complexity analysis on Python files first.', 
                    ha='center', va='center', fontsize=14, color='#a0a0a0', fontweight=500)
-            ax.axis('off')
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                       facecolor='#1a1a1a', edgecolor='none')
-            buf.seek(0)
-            plt.close()
-            return Image.open(buf)
+            return Visualizations._figure_to_image(fig)
+        
+        plt = _pyplot()
+        import seaborn as sns
         
         # Prepare data - sort by complexity (descending) and take top files
         file_complexity_pairs = []
@@ -188,13 +288,7 @@ class Visualizations:
         plt.tight_layout()
         
         # Convert to PIL Image
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                   facecolor='#1a1a1a', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        
-        return Image.open(buf)
+        return Visualizations._figure_to_image()
     
     @staticmethod
     def plot_error_timeline(log_data: Dict, time_window_hours: int = 24) -> Image.Image:
@@ -207,6 +301,9 @@ class Visualizations:
         Returns:
             PIL Image of the timeline
         """
+        plt = _pyplot()
+        import matplotlib.dates as mdates
+
         errors = log_data.get("errors", [])
         warnings = log_data.get("warnings", [])
         
@@ -295,12 +392,7 @@ class Visualizations:
             
             # Save and return the 0-error chart
             plt.tight_layout()
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                       facecolor='#1a1a1a', edgecolor='none')
-            buf.seek(0)
-            plt.close()
-            return Image.open(buf)
+            return Visualizations._figure_to_image()
         else:
             # Group by hour
             error_counts = defaultdict(int)
@@ -359,11 +451,5 @@ class Visualizations:
         plt.tight_layout()
         
         # Convert to PIL Image
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                   facecolor='#1a1a1a', edgecolor='none')
-        buf.seek(0)
-        plt.close()
-        
-        return Image.open(buf)
+        return Visualizations._figure_to_image()
 
@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import project.tools.tools as tools_module
+
+
+@pytest.fixture(autouse=True)
+def isolated_tool_cache(tmp_path_factory, monkeypatch):
+    """Keep the tool memo database out of the repository during tests.
+
+    It gets its own directory, apart from tmp_path, which tests fill with
+    sample repositories.
+    """
+    monkeypatch.setattr(tools_module, "TOOL_CACHE_DIR", str(tmp_path_factory.mktemp("tool_cache")))
@@ -3,11 +3,12 @@ Tests for A2A Protocol (Agent-to-Agent communication)
 """
 import os
 import sys
+from dataclasses import asdict
 
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from project.core.a2a_protocol import PlannerOutput, WorkerOutput, EvaluatorOutput
+from project.core.a2a_protocol import PlannerOutput, WorkerOutput, EvaluatorOutput, AgentResult
 
 
 class TestA2AProtocol:
@@ -34,6 +35,9 @@ class TestA2AProtocol:
         result_dict = output.to_dict()
         assert isinstance(result_dict, dict)
         assert result_dict["action"] == "repo_analysis"
+        assert result_dict == asdict(output)
+        result_dict["action"] = "general_chat"
+        assert output.action == "repo_analysis"
     
     def test_worker_output(self):
         """Test WorkerOutput dataclass."""
@@ -67,6 +71,27 @@ class TestA2AProtocol:
         result_dict = output.to_dict()
         assert isinstance(result_dict, dict)
         assert result_dict["status"] == "APPROVED"
+    
+    def test_agent_result(self):
+        """Test AgentResult dataclass."""
+        image = object()
+        output = AgentResult(
+            response="Analysis complete",
+            plan={"action": "repo_analysis"},
+            safety_status="APPROVED",
+            visualizations={"dependency_graph_image": image}
+        )
+        
+        assert output.dead_code_report == {}
+        assert output.refactor_suggestions_report == []
+        
+        # Test to_dict
+        result_dict = output.to_dict()
+        assert isinstance(result_dict, dict)
+        assert result_dict["safety_status"] == "APPROVED"
+        assert "postmortem_report" in result_dict
+        # Visualizations are passed through, not copied
+        assert result_dict["visualizations"]["dependency_graph_image"] is image
 
 
 if __name__ == "__main__":
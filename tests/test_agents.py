@@ -3,6 +3,7 @@ Tests for agent components (Planner, Worker, Evaluator)
 """
 import os
 import sys
+import pytest
 
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -10,6 +11,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from project.agents.planner import Planner
 from project.agents.worker import Worker
 from project.agents.evaluator import Evaluator
+from project.tools.tools import Tools
+from project.core.context_engineering import WORKER_PROMPT
 
 
 class TestPlanner:
@@ -48,6 +51,18 @@ class TestPlanner:
         safe_input = "analyze the codebase"
         result = self.planner._check_destructive_request(safe_input)
         assert result == False
+    
+    def test_check_destructive_request_shared_patterns(self):
+        """Test planner uses its own destructive patterns, not the Evaluator's."""
+        assert self.planner._check_destructive_request("DROP TABLE users") == True
+        assert self.planner._check_destructive_request("remove the build directory") == True
+        # Draft-only patterns must not refuse ordinary analysis requests
+        assert self.planner._check_destructive_request("Analyze the platform and check the re-run logic") == False
+        assert self.planner._check_destructive_request("Why did my worker get kill -9 signals in the logs?") == False
+        assert self.planner._check_destructive_request("Analyze the logs for DROP DATABASE errors") == False
+        assert self.planner._check_destructive_request("Find TRUNCATE TABLE statements") == False
+        # Code-execution patterns are only banned in Evaluator drafts
+        assert self.planner._check_destructive_request("find os.system calls") == False
 
 
 class TestWorker:
@@ -58,6 +73,12 @@ class TestWorker:
         self.worker = Worker()
         self.worker.mock_mode = True
     
+    def test_static_instructions_in_system_prompt(self):
+        """Test the static report instructions form the cacheable system prefix."""
+        system = self.worker.client.system_instruction
+        assert system.startswith(WORKER_PROMPT)
+        assert "IMPORTANT INSTRUCTIONS" in system
+    
     def test_work_repo_analysis(self):
         """Test worker handling repo analysis."""
         planner_output = {
@@ -104,6 +125,47 @@ class TestWorker:
         result = self.worker.work(planner_output)
         assert "draft_response" in result
         assert "cannot" in result["draft_response"].lower() or "read-only" in result["draft_response"].lower()
+    
+    def test_handle_refactor_without_targets(self, tmp_path):
+        """Test refactoring picks the most complex files when no paths are given."""
+        (tmp_path / "simple.py").write_text("def f():\n    return 1\n")
+        (tmp_path / "branchy.py").write_text(
+            "def g(x):\n    if x:\n        return 1\n    for i in x:\n        pass\n")
+        context, tools_used, results = self.worker._handle_refactor([], str(tmp_path))
+        files = [s["file"] for s in results["refactor_suggestions"]]
+        assert files == ["branchy.py", "simple.py"]
+        assert "extract_imports" in tools_used
+    
+    def test_repo_analysis_reused_until_changed(self, tmp_path, monkeypatch):
+        """Test an unchanged git repository is not analyzed twice."""
+        import shutil
+        import subprocess
+        if shutil.which("git") is None:
+            pytest.skip("git not installed")
+        (tmp_path / "app.py").write_text("def f():\n    return 1\n")
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        
+        calls = []
+        original = Tools.read_directory_tree
+        monkeypatch.setattr(Tools, "read_directory_tree",
+                            lambda path: calls.append(path) or original(path))
+        
+        first = self.worker._handle_repo_analysis([], str(tmp_path))
+        second = self.worker._handle_repo_analysis([], str(tmp_path))
+        assert len(calls) == 1
+        assert second[0] == first[0]
+        # Charts are drawn again rather than kept alive by the cache
+        assert second[2]["visualizations"] is not first[2]["visualizations"]
+        assert all("visualizations" not in entry[1][2] for entry in self.worker._repo_cache.values())
+        
+        # The app's own log file is not part of the repository's state
+        (tmp_path / "autopilot_devops.log").write_text("12:00:00 | INFO | request\n")
+        self.worker._handle_repo_analysis([], str(tmp_path))
+        assert len(calls) == 1
+        
+        (tmp_path / "app.py").write_text("def f():\n    return 2\n\ndef g():\n    pass\n")
+        self.worker._handle_repo_analysis([], str(tmp_path))
+        assert len(calls) == 2
 
 
 class TestEvaluator:
@@ -156,6 +218,41 @@ class TestEvaluator:
         text = "This is safe text"
         result = self.evaluator._contains_execution_commands(text)
         assert result == False
+    
+    def test_evaluator_keeps_draft_only_patterns(self):
+        """Test the Evaluator still bans the patterns the Planner skips."""
+        assert self.evaluator._contains_destructive_commands("Run kill -9 1234") == True
+        assert self.evaluator._contains_destructive_commands("DROP DATABASE prod") == True
+        # Directory removal was only ever a Planner pattern
+        assert self.evaluator._contains_destructive_commands("remove the build directory") == False
+    
+    def test_safety_filters_context(self):
+        """Test case-insensitive matching and refusal/warning context."""
+        assert self.evaluator._contains_destructive_commands("Run DROP TABLE users") == True
+        assert self.evaluator._contains_destructive_commands("You should NOT ALLOWED to DROP TABLE") == False
+        assert self.evaluator._contains_execution_commands("os.system('ls')  # Warning: unsafe") == False
+        assert self.evaluator._contains_execution_commands("BASH -C 'ls'") == True
+    
+    def test_prompt_fills_placeholders_once(self, monkeypatch):
+        """Test a placeholder typed by the user is not filled with the draft."""
+        prompts = []
+        monkeypatch.setattr(self.evaluator.client, "generate_json",
+                            lambda prompt, cache=True: prompts.append((prompt, cache)) or {"status": "APPROVED"})
+        self.evaluator.mock_mode = False
+        result = self.evaluator.evaluate({"draft_response": "Safe analysis"}, "Explain {agent_response}")
+        assert result["status"] == "APPROVED"
+        prompt, cache = prompts[0]
+        assert "User Input: Explain {agent_response}" in prompt
+        assert "Agent Response: Safe analysis" in prompt
+        assert cache is False
+    
+    def test_contains_unsafe_diffs(self):
+        """Test unsafe diff detection."""
+        header = "--- a/app.py\n+++ b/app.py\n"
+        removed = "".join(f"-line {i}\n" for i in range(60))
+        assert self.evaluator._contains_unsafe_diffs(header + "-import os\n" + removed) == True
+        assert self.evaluator._contains_unsafe_diffs(header + removed) == False
+        assert self.evaluator._contains_unsafe_diffs("-import os\n" + removed) == False
 
 
 if __name__ == "__main__":
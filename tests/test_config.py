@@ -3,6 +3,7 @@ Tests for configuration management (project/config.py)
 """
 import os
 import sys
+import pytest
 
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -19,12 +20,45 @@ class TestConfig:
         assert isinstance(keys, list)
         # In test environment, might be empty or have test keys
     
+    def test_gemini_api_keys_parsed_once(self, monkeypatch):
+        """Test keys are parsed once and re-parsed when the setting changes."""
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", " key1; key2,,")
+        keys = Config.GEMINI_API_KEYS()
+        assert keys == ["key1", "key2"]
+        assert Config.GEMINI_API_KEYS() is keys
+        
+        monkeypatch.setenv("GEMINI_API_KEYS", "key3")
+        Config.reload()
+        assert Config.GEMINI_API_KEYS() == ["key3"]
+    
+    def test_validate_follows_key_changes(self, monkeypatch):
+        """Test a cached validation result is dropped when the keys change."""
+        monkeypatch.setattr(Config, "MOCK_MODE", False)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "")
+        with pytest.raises(ValueError):
+            Config.validate()
+        with pytest.raises(ValueError):
+            Config.validate()
+        
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1")
+        Config.validate()
+    
     def test_rotate_gemini_key(self):
         """Test rotating Gemini API keys."""
         key = Config.rotate_gemini_key()
         assert isinstance(key, str)
         # Should return a key or empty string
     
+    def test_rotate_gemini_key_round_robin(self, monkeypatch):
+        """Test keys rotate in turn and excluded keys are skipped."""
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1,key2,key3")
+        picked = [Config.rotate_gemini_key() for _ in range(3)]
+        assert sorted(picked) == ["key1", "key2", "key3"]
+        
+        assert Config.rotate_gemini_key(exclude={"key1", "key2"}) == "key3"
+        # Once every key is excluded, rotation carries on regardless
+        assert Config.rotate_gemini_key(exclude={"key1", "key2", "key3"}) in picked
+    
     def test_max_retries(self):
         """Test getting max retries."""
         retries = Config.max_retries()
@@ -48,6 +82,5 @@ class TestConfig:
 
 
 if __name__ == "__main__":
-    import pytest
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,203 @@
+"""
+Tests for the Gemini client response cache (project/core/gemini_client.py)
+"""
+import os
+import sys
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from project.config import Config
+from project.core import gemini_client
+from project.core.gemini_client import GeminiClient
+
+
+class TestGenerateJsonCache:
+    """Test suite for generate_json response caching."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        """Point the cache at a temporary file and count Gemini calls."""
+        monkeypatch.setattr(Config, "LLM_CACHE_FILE", str(tmp_path / "llm_cache.json"))
+        monkeypatch.setattr(Config, "LLM_CACHE_TTL", 60.0)
+        self.calls = []
+
+        def fake_generate_response(client, prompt, json_mode=False, stream=False):
+            self.calls.append(prompt)
+            return '```json\n{"status": "APPROVED"}\n```'
+
+        monkeypatch.setattr(GeminiClient, "generate_response", fake_generate_response)
+        self.client = GeminiClient("system")
+
+    def test_repeated_prompt_is_cached(self):
+        """Test an identical prompt is answered from the cache."""
+        first = self.client.generate_json("same prompt")
+        second = self.client.generate_json("same prompt")
+        assert first == second == {"status": "APPROVED"}
+        assert len(self.calls) == 1
+        assert os.path.exists(Config.LLM_CACHE_FILE)
+
+    def test_cached_result_is_a_copy(self):
+        """Test mutating a returned dict does not change the cache."""
+        self.client.generate_json("same prompt")
+        self.client.generate_json("same prompt")["status"] = "REJECTED"
+        assert self.client.generate_json("same prompt") == {"status": "APPROVED"}
+
+    def test_key_includes_system_instruction(self):
+        """Test different agents do not share cached answers."""
+        self.client.generate_json("same prompt")
+        GeminiClient("other system").generate_json("same prompt")
+        assert len(self.calls) == 2
+
+    def test_cache_false_always_calls_gemini(self):
+        """Test callers can opt out of the cache, as the Evaluator does."""
+        self.client.generate_json("same prompt", cache=False)
+        self.client.generate_json("same prompt", cache=False)
+        assert len(self.calls) == 2
+        assert not os.path.exists(Config.LLM_CACHE_FILE)
+
+    def test_ttl_zero_disables_cache(self, monkeypatch):
+        """Test a zero TTL always calls Gemini."""
+        monkeypatch.setattr(Config, "LLM_CACHE_TTL", 0.0)
+        self.client.generate_json("same prompt")
+        self.client.generate_json("same prompt")
+        assert len(self.calls) == 2
+        assert not os.path.exists(Config.LLM_CACHE_FILE)
+
+    def test_text_response_cached_by_prompt(self):
+        """Test text responses are cached per prompt."""
+        first = self.client.generate_cached_response("analyze the repo", ttl=60)
+        second = self.client.generate_cached_response("analyze the repo", ttl=60)
+        assert first == second
+        assert len(self.calls) == 1
+        # Text and JSON answers to the same prompt are kept apart
+        self.client.generate_json("analyze the repo")
+        assert len(self.calls) == 2
+
+    def test_text_response_expires(self):
+        """Test an expired text response calls Gemini again."""
+        self.client.generate_cached_response("analyze the repo", ttl=-1)
+        self.client.generate_cached_response("analyze the repo", ttl=60)
+        assert len(self.calls) == 2
+
+
+
+class TestSdkClientReuse:
+    """Test suite for sharing SDK clients between calls."""
+
+    def test_client_reused_per_key(self, monkeypatch):
+        """Test one genai.Client is created per API key across GeminiClients."""
+        created = []
+
+        class FakeModels:
+            def generate_content(self, model, contents, config):
+                return type("Response", (), {"text": "ok", "usage_metadata": None})()
+
+        class FakeSdkClient:
+            def __init__(self, api_key):
+                created.append(api_key)
+                self.models = FakeModels()
+
+        monkeypatch.setattr(gemini_client, "_sdk_clients", {})
+        monkeypatch.setattr(gemini_client.genai, "Client", FakeSdkClient)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1")
+
+        assert GeminiClient("a").generate_response("hi") == "ok"
+        assert GeminiClient("b").generate_response("hi") == "ok"
+        assert created == ["key1"]
+
+    def test_rate_limited_key_skipped(self, monkeypatch):
+        """Test a key rejected with 429 is retried with another and then avoided."""
+        from google.genai import errors
+        used = []
+
+        class FakeSdkClient:
+            def __init__(self, api_key):
+                self.models = self
+                self.api_key = api_key
+
+            def generate_content(self, model, contents, config):
+                used.append(self.api_key)
+                if self.api_key == "bad":
+                    raise errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+                return type("Response", (), {"text": "ok", "usage_metadata": None})()
+
+        monkeypatch.setattr(gemini_client, "_sdk_clients", {})
+        monkeypatch.setattr(gemini_client.genai, "Client", FakeSdkClient)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "bad,good")
+        monkeypatch.setattr(Config, "_unhealthy", {})
+        client = GeminiClient("a")
+        client.retry_delay = 0
+
+        while "bad" not in used:
+            assert client.generate_response("hi") == "ok"
+        assert used[-1] == "good"
+        used.clear()
+        for _ in range(3):
+            assert client.generate_response("hi") == "ok"
+        assert used == ["good"] * 3
+
+    def test_stream_joins_chunks(self, monkeypatch):
+        """Test a streamed response is returned as one stripped string."""
+        class StreamingSdkClient:
+            def __init__(self, api_key):
+                self.models = self
+
+            def generate_content_stream(self, model, contents, config):
+                for text in ["Hello", None, ", world", "\n"]:
+                    yield type("Chunk", (), {"text": text, "usage_metadata": None})()
+
+        monkeypatch.setattr(gemini_client, "_sdk_clients", {})
+        monkeypatch.setattr(gemini_client.genai, "Client", StreamingSdkClient)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1")
+
+        assert GeminiClient("a").generate_response("hi", stream=True) == "Hello, world"
+
+    def test_no_sleep_after_last_attempt(self, monkeypatch):
+        """Test a failed final attempt returns without backing off."""
+        class FailingSdkClient:
+            def __init__(self, api_key):
+                self.models = self
+
+            def generate_content(self, model, contents, config):
+                raise ConnectionError("offline")
+
+        sleeps = []
+        monkeypatch.setattr(gemini_client.time, "sleep", sleeps.append)
+        monkeypatch.setattr(gemini_client, "_sdk_clients", {})
+        monkeypatch.setattr(gemini_client.genai, "Client", FailingSdkClient)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1,key2")
+
+        assert GeminiClient("a").generate_response("hi") is None
+        assert len(sleeps) == 1
+
+    def test_keys_read_per_call(self, monkeypatch):
+        """Test keys configured after the client was created are validated and all tried."""
+        used = []
+
+        class FailingSdkClient:
+            def __init__(self, api_key):
+                self.models = self
+                self.api_key = api_key
+
+            def generate_content(self, model, contents, config):
+                used.append(self.api_key)
+                raise ConnectionError("offline")
+
+        monkeypatch.setattr(gemini_client.time, "sleep", lambda seconds: None)
+        monkeypatch.setattr(gemini_client, "_sdk_clients", {})
+        monkeypatch.setattr(gemini_client.genai, "Client", FailingSdkClient)
+        monkeypatch.setattr(Config, "MOCK_MODE", False)
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "")
+        client = GeminiClient("a")
+        assert client.generate_response("hi") is None
+        assert used == []
+
+        monkeypatch.setattr(Config, "_GEMINI_API_KEYS_RAW", "key1,key2")
+        assert client.generate_response("hi") is None
+        assert sorted(used) == ["key1", "key2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
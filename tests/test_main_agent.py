@@ -8,6 +8,8 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from project.main_agent import MainAgent
+from project.tools.github_tools import GitHubTools
+from project.core.a2a_protocol import AgentResult
 
 
 class TestMainAgent:
@@ -46,6 +48,38 @@ class TestMainAgent:
         # Should be rejected or contain safe refusal
         assert result["safety_status"] == "REJECTED" or "cannot" in result["response"].lower()
     
+    def test_run_returns_agent_result(self):
+        """Test that run() returns a typed AgentResult."""
+        result = self.agent.run("Analyze this repository")
+        assert isinstance(result, AgentResult)
+        assert isinstance(result.response, str)
+        assert isinstance(result.visualizations, dict)
+        assert isinstance(result.refactor_suggestions_report, list)
+    
+    def test_run_uses_session_github_token(self, monkeypatch):
+        """Test that a per-call GitHub token is used for cloning."""
+        tokens = []
+        
+        def fake_clone(repo_url, github_token=None):
+            tokens.append(github_token)
+            return {"success": False, "error": "offline"}
+        
+        monkeypatch.setattr(GitHubTools, "clone_repository", staticmethod(fake_clone))
+        self.agent.run("Analyze this repository", repo_url="https://github.com/a/b", github_token="ghp_session")
+        assert tokens == ["ghp_session"]
+    
+    def test_extract_reports(self):
+        """Test report extraction from top-level and nested analysis results."""
+        reports = self.agent._extract_reports({
+            "dead_code": {"unused_functions": ["f"]},
+            "app.log": {"postmortem": {"error_count": 1}},
+            "visualizations": {}
+        })
+        assert reports["dead_code"] == {"unused_functions": ["f"]}
+        assert reports["postmortem"] == {"error_count": 1}
+        assert reports["migration_plan"] == {}
+        assert self.agent._extract_reports(None)["refactor_suggestions"] == []
+    
     def test_get_conversation_summary(self):
         """Test getting conversation summary."""
         self.agent.handle_message("Hello")
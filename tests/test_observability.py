@@ -0,0 +1,100 @@
+"""
+Tests for the agent logger (project/core/observability.py)
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from project.core.observability import Logger
+
+
+class TestLogger:
+    """Test suite for Logger class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.logger = Logger(log_to_file=False)
+    
+    def test_get_stats_counts_levels(self):
+        """Test stats count entries by level, not by message text."""
+        self.logger.log("Test", "an ERROR in the message text")
+        self.logger.error("Test", "failed")
+        self.logger.warning("Test", "careful")
+        stats = self.logger.get_stats()
+        assert stats["total_logs"] == 3
+        assert stats["by_level"] == {"INFO": 1, "ERROR": 1, "WARNING": 1, "DEBUG": 0}
+    
+    def test_clear_resets_stats(self):
+        """Test clearing logs also resets the level counts."""
+        self.logger.info("Test", "hello")
+        self.logger.clear()
+        stats = self.logger.get_stats()
+        assert stats["total_logs"] == 0
+        assert stats["by_level"]["INFO"] == 0
+    
+    def test_stats_count_entries_dropped_from_ring(self, monkeypatch):
+        """Test totals keep counting once old entries leave a full ring."""
+        from project.core import observability
+        monkeypatch.setattr(observability, "LOG_RING_SIZE", 2)
+        small_logger = Logger(log_to_file=False)
+        for i in range(5):
+            small_logger.info("Test", f"entry {i}")
+        stats = small_logger.get_stats()
+        assert stats["total_logs"] == 5
+        assert stats["stored_logs"] == 2
+        assert stats["by_level"]["INFO"] == 5
+
+    
+    def test_get_logs_last_n(self):
+        """Test returning only the most recent entries."""
+        for i in range(5):
+            self.logger.info("Test", f"message {i}")
+        lines = self.logger.get_logs(last_n=2).splitlines()
+        assert len(lines) == 2
+        assert lines[-1].endswith("message 4")
+    
+    def test_file_logging(self, tmp_path):
+        """Test entries are written to the log file after its header."""
+        log_file = tmp_path / "agent_logs.txt"
+        file_logger = Logger(log_to_file=True, log_file=str(log_file))
+        file_logger.warning("Test", "written to disk")
+        file_logger.flush()
+        content = log_file.read_text(encoding="utf-8")
+        assert content.startswith("=== ")
+        assert "WARNING Test: written to disk" in content
+
+    
+    def test_flush_registered_once_at_exit(self, monkeypatch):
+        """Test restarting the output thread does not queue another exit flush."""
+        from project.core import observability
+        registered = []
+        monkeypatch.setattr(observability.atexit, "register", registered.append)
+        restarted_logger = Logger(log_to_file=False)
+        restarted_logger.info("Test", "first")
+        restarted_logger.flush()
+        # As in a forked child, where the thread no longer runs
+        import threading
+        restarted_logger._io_thread = threading.Thread(target=lambda: None)
+        restarted_logger.info("Test", "second")
+        assert restarted_logger._io_thread.is_alive()
+        assert registered == [restarted_logger.flush]
+    
+    def test_min_level_drops_entries(self):
+        """Test entries below min_level are neither stored nor counted."""
+        quiet_logger = Logger(min_level="INFO")
+        quiet_logger.debug("Test", "hidden", data={"big": "payload"})
+        quiet_logger.info("Test", "shown")
+        assert quiet_logger.get_stats()["total_logs"] == 1
+        assert "hidden" not in quiet_logger.get_logs()
+    
+    def test_data_serialized_compactly(self):
+        """Test dict data is logged as single-line JSON."""
+        self.logger.info("Test", "with data", data={"files": ["a.py"], "count": 1})
+        assert self.logger.get_logs().endswith('Data: {"files":["a.py"],"count":1}')
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
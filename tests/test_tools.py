@@ -100,6 +100,28 @@ class TestClass:
         assert result["complexity"] > 0
         assert len(result["functions"]) > 0
     
+    def test_compute_complexity_memoized(self, monkeypatch):
+        """Test complexity results are reused until the file changes."""
+        import project.tools.tools as tools_module
+        monkeypatch.setattr(tools_module, "TOOL_CACHE_DIR", os.path.join(self.test_dir, "cache"))
+        parses = []
+        original_parse = tools_module.ast.parse
+        monkeypatch.setattr(tools_module.ast, "parse",
+                            lambda *args, **kwargs: parses.append(args) or original_parse(*args, **kwargs))
+        first = Tools.compute_complexity(self.test_file)
+        assert Tools.compute_complexity(self.test_file) == first
+        assert len(parses) == 1
+        
+        with open(self.test_file, 'a') as f:
+            f.write("\ndef added():\n    pass\n")
+        os.utime(self.test_file, ns=(0, os.stat(self.test_file).st_mtime_ns + 1))
+        names = [func["name"] for func in Tools.compute_complexity(self.test_file)["functions"]]
+        assert "added" in names
+        assert len(parses) == 2
+        # The stale result was replaced rather than kept alongside the new one
+        rows = tools_module._memo_db().execute("SELECT COUNT(*) FROM tool_memo").fetchone()[0]
+        assert rows == 1
+    
     def test_detect_dead_code(self):
         """Test dead code detection."""
         result = Tools.detect_dead_code(self.test_dir)
@@ -151,6 +173,23 @@ class TestClass:
         assert len(result["errors"]) > 0
         assert len(result["warnings"]) > 0
     
+    def test_parse_logs_max_lines(self):
+        """Test that log parsing stops after max_lines."""
+        log_file = os.path.join(self.test_dir, "long.log")
+        with open(log_file, 'w') as f:
+            for i in range(50):
+                f.write(f"2024-01-01 10:00:{i % 60:02d} ERROR: failure {i}\n")
+        
+        result = Tools.parse_logs(log_file, max_lines=10)
+        assert len(result["entries"]) == 10
+        assert result["entries"][-1]["content"].endswith("failure 9")
+    
+    def test_parse_logs_missing_file(self):
+        """Test log parsing of a missing file."""
+        result = Tools.parse_logs(os.path.join(self.test_dir, "missing.log"))
+        assert result["entries"] == []
+        assert result["error"] == "Log file not found"
+    
     def test_cluster_errors(self):
         """Test error clustering."""
         log_data = {
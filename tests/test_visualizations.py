@@ -30,6 +30,21 @@ class TestVisualizations:
         assert result.size[0] > 0
         assert result.size[1] > 0
     
+    def test_plot_dependency_graph_cached(self):
+        """Test identical dependency data reuses the rendered image."""
+        dependency_data = {
+            "nodes": ["cache_a.py", "cache_b.py"],
+            "edges": [{"from": "cache_a.py", "to": "cache_b.py"}]
+        }
+        
+        first = Visualizations.plot_dependency_graph(dependency_data)
+        second = Visualizations.plot_dependency_graph(dict(dependency_data))
+        assert first is second
+        
+        dependency_data["nodes"].append("cache_c.py")
+        third = Visualizations.plot_dependency_graph(dependency_data)
+        assert third is not first
+    
     def test_plot_dependency_graph_empty(self):
         """Test dependency graph with empty data."""
         dependency_data = {
@@ -83,6 +98,26 @@ class TestVisualizations:
         
         result = Visualizations.plot_error_timeline(log_data)
         assert isinstance(result, Image.Image)
+    
+    def test_error_placeholder(self):
+        """Test error placeholder rendering."""
+        import matplotlib.pyplot as plt
+        open_figures = plt.get_fignums()
+        result = Visualizations.error_placeholder("Error generating heatmap:\nboom")
+        assert isinstance(result, Image.Image)
+        assert result.size[0] > 0
+        # Drawn on a standalone Figure, outside pyplot's figure registry
+        assert plt.get_fignums() == open_figures
+    
+    def test_plotting_imported_lazily(self):
+        """Test loading the agents does not import the plotting libraries."""
+        import subprocess
+        code = ("import sys, project.agents.worker; "
+                "print(any(m in sys.modules for m in ('matplotlib', 'seaborn', 'networkx')))")
+        root = os.path.join(os.path.dirname(__file__), '..')
+        output = subprocess.run([sys.executable, "-c", code], cwd=root,
+                                capture_output=True, text=True, check=True).stdout
+        assert output.strip() == "False"
 
 
 if __name__ == "__main__":